@@ -0,0 +1,676 @@
+"""
+Micro-benchmarks for the subtitle tooling.
+
+Usage:
+    python bench_srt.py replace
+    python bench_srt.py sc2tc [--base-dir 課綱]
+    python bench_srt.py cuestore
+    python bench_srt.py split [--lengths 200 2000] [--base-dir 課綱]
+    python bench_srt.py timecode [--cues 1000000]
+    python bench_srt.py mmap [--cues 1000000]
+    python bench_srt.py merge [--cues 1000000]
+    python bench_srt.py tree [--chapters 6 --units 10 --cues 400 --sc-ratio 0.05 --multiline-ratio 0.2] [--save]
+    python bench_srt.py compare [BASE [HEAD]] [--threshold 0.1]
+"""
+
+import argparse
+import glob
+import json
+import os
+import random
+import re
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+
+from srt_cues import CueStore, parse_cues
+from srt_mmap import MappedTranscript
+from srt_replace import compile_replacements
+from srt_text import balanced_break_offsets, break_offsets, split_text
+from srt_timecode import format_timecode, last_timing, parse_timecode, read_last_timing
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_BASE_DIR = os.path.join(HERE, "課綱")
+# One JSON line per `tree` run, compared across commits by `compare`
+RESULTS_PATH = os.path.join(HERE, ".bench_results.jsonl")
+
+
+def make_transcript(cue_count, vocabulary, seed=0):
+    """Builds a synthetic SRT body that mixes rule keys with filler text."""
+    rng = random.Random(seed)
+    filler = ["我們", "這邊", "可以", "設定", "然後", "就是", "流程", "今天", "模型", "一下"]
+    blocks = []
+    for n in range(1, cue_count + 1):
+        words = [rng.choice(vocabulary) if rng.random() < 0.2 else rng.choice(filler) for _ in range(12)]
+        start = n * 3
+        blocks.append(
+            f"{n}\n"
+            f"00:{start // 60 % 60:02d}:{start % 60:02d},000 --> 00:{(start + 2) // 60 % 60:02d}:{(start + 2) % 60:02d},500\n"
+            f"{''.join(words)}\n"
+        )
+    return "\n".join(blocks)
+
+
+def best_of(func, repeat=3):
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def legacy_replace(content, replacements):
+    # Plain str.replace() has no notion of scoped rules; they run unscoped
+    for old, new, *_ in replacements:
+        content = content.replace(old, new)
+    return content
+
+
+def bench_replace(args):
+    from process_srt_global_review import get_global_replacements
+
+    replacements = get_global_replacements()
+    replacer = compile_replacements(replacements)
+    vocabulary = [rule[0] for rule in replacements]
+
+    print(f"{len(replacements)} rules")
+    print(f"{'cues':>8} {'KB':>8} {'legacy ms':>10} {'single ms':>10} {'single us/KB':>13}")
+    for cue_count in args.sizes:
+        content = make_transcript(cue_count, vocabulary)
+        size_kb = len(content.encode("utf-8")) / 1024
+        legacy = best_of(lambda: legacy_replace(content, replacements))
+        single = best_of(lambda: replacer.apply(content))
+        print(f"{cue_count:>8} {size_kb:>8.0f} {legacy * 1000:>10.2f} {single * 1000:>10.2f} {single * 1e6 / size_kb:>13.2f}")
+
+
+def load_tree_texts(base_dir, vocabulary):
+    """Returns the .srt contents under base_dir, or synthetic ones if there are none."""
+    paths = sorted(glob.glob(os.path.join(base_dir, "**", "*.srt"), recursive=True))
+    if paths:
+        texts = []
+        for path in paths:
+            with open(path, 'r', encoding='utf-8') as f:
+                texts.append(f.read())
+        return texts, f"{len(paths)} files under {base_dir}"
+    texts = [make_transcript(400, vocabulary, seed=n) for n in range(40)]
+    return texts, f"no .srt under {base_dir}, using {len(texts)} synthetic files"
+
+
+def bench_sc2tc(args):
+    from check_and_fix_srt_global import SC_TO_TC_PAIRS, sc_to_tc_table
+
+    # The dict the converter used to loop over, repeated keys resolved the same way
+    mapping = dict(SC_TO_TC_PAIRS)
+    converter = sc_to_tc_table().converter
+    texts, source = load_tree_texts(args.base_dir, list(mapping))
+    print(source)
+
+    legacy_out = [legacy_replace(text, mapping.items()) for text in texts]
+    fast_out = [converter.apply(text) for text in texts]
+    mismatches = sum(a.encode("utf-8") != b.encode("utf-8") for a, b in zip(legacy_out, fast_out))
+
+    legacy = best_of(lambda: [legacy_replace(text, mapping.items()) for text in texts])
+    fast = best_of(lambda: [converter.apply(text) for text in texts])
+    print(f"{len(mapping)} mappings: {len(converter.phrases)} phrases, {len(converter.chars)} characters")
+    print(f"legacy {legacy * 1000:.2f} ms, translate {fast * 1000:.2f} ms, speedup {legacy / fast:.1f}x")
+    print(f"byte-identical output: {len(texts) - mismatches}/{len(texts)} files")
+
+
+def measure_memory(build):
+    tracemalloc.start()
+    kept = build()
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del kept
+    return size
+
+
+def bench_cuestore(args):
+    # "overhead" is everything except the characters of the subtitle text itself
+    print(f"{'cues':>8} {'text B/cue':>11} {'list B/cue':>11} {'store B/cue':>12} {'overhead ratio':>15}")
+    for cue_count in args.sizes:
+        content = make_transcript(cue_count, ["Dify", "Workflow", "Agent"])
+        text_bytes = sys.getsizeof(CueStore(parse_cues(content)).text) / cue_count
+        as_list = measure_memory(lambda: list(parse_cues(content))) / cue_count
+        as_store = measure_memory(lambda: CueStore(parse_cues(content))) / cue_count
+        ratio = (as_list - text_bytes) / (as_store - text_bytes)
+        print(f"{cue_count:>8} {text_bytes:>11.0f} {as_list:>11.0f} {as_store:>12.0f} {ratio:>15.1f}")
+
+
+def legacy_split_text(text, max_length=20):
+    # The split_text the processing scripts carried before srt_text
+    text = text.strip()
+    if len(text) <= max_length:
+        return [text]
+    parts = re.split(r'([,，。、\s])', text)
+    lines = []
+    current_line = ""
+    for part in parts:
+        if len(current_line) + len(part) > max_length:
+            if current_line:
+                lines.append(current_line)
+            current_line = part
+        else:
+            current_line += part
+    if current_line:
+        lines.append(current_line)
+    lines = [line.strip() for line in lines if line.strip()]
+    final_lines = []
+    for line in lines:
+        if len(line) <= max_length:
+            final_lines.append(line)
+        else:
+            for i in range(0, len(line), max_length):
+                final_lines.append(line[i:i+max_length])
+    return final_lines
+
+
+def make_block(length, seed=0):
+    """A long merged cue text: Chinese and English words with sparse punctuation."""
+    rng = random.Random(seed)
+    words = ["我們", "這邊", "可以", "設定", "然後", "工作流程", "Dify", "Workflow", "API Key", "模型", "一下"]
+    marks = ["，", "。", "、", " ", ""]
+    parts = []
+    size = 0
+    while size < length:
+        part = rng.choice(words) + (rng.choice(marks) if rng.random() < 0.3 else "")
+        parts.append(part)
+        size += len(part)
+    return "".join(parts)[:length]
+
+
+def bench_split(args):
+    print(f"{'chars':>8} {'legacy us':>10} {'split us':>10} {'offsets us':>11} {'cjk us':>8} {'balanced us':>12} {'same':>5}")
+    for length in args.lengths:
+        blocks = [make_block(length, seed=n) for n in range(50)]
+        same = all(legacy_split_text(b) == split_text(b) for b in blocks)
+        legacy = best_of(lambda: [legacy_split_text(b) for b in blocks]) / len(blocks)
+        split = best_of(lambda: [split_text(b) for b in blocks]) / len(blocks)
+        offsets = best_of(lambda: [break_offsets(b) for b in blocks]) / len(blocks)
+        cjk = best_of(lambda: [break_offsets(b, cjk_widths=True) for b in blocks]) / len(blocks)
+        balanced = best_of(lambda: [balanced_break_offsets(b) for b in blocks]) / len(blocks)
+        print(f"{length:>8} {legacy * 1e6:>10.1f} {split * 1e6:>10.1f} {offsets * 1e6:>11.1f} {cjk * 1e6:>8.1f} "
+              f"{balanced * 1e6:>12.1f} {'yes' if same else 'NO':>5}")
+
+    # What a whole tree pays: every cue's joined text goes through the breaker once
+    texts, source = load_tree_texts(args.base_dir, ["Dify", "Workflow", "Agent"])
+    cue_texts = [" ".join(cue.lines) for text in texts for cue in parse_cues(text)]
+    greedy = best_of(lambda: [break_offsets(t) for t in cue_texts])
+    balanced = best_of(lambda: [balanced_break_offsets(t) for t in cue_texts])
+    orphans = [sum(1 for lines in map(lambda t: split_text(t, balanced=mode), cue_texts)
+                   if len(lines) > 1 and len(lines[-1]) <= 2) for mode in (False, True)]
+    print(f"{source}: {len(cue_texts)} cues")
+    print(f"greedy {greedy * 1000:.1f} ms ({orphans[0]} orphan lines), balanced {balanced * 1000:.1f} ms ({orphans[1]} orphan lines)")
+
+
+LEGACY_TIMESTAMP = re.compile(r'(\d{2}):(\d{2}):(\d{2})[,.](\d{3})')
+
+
+def legacy_last_end_ms(content):
+    # What update_course_durations.parse_duration_from_srt used to do
+    match = list(LEGACY_TIMESTAMP.finditer(content))[-1]
+    hours, minutes, seconds, millis = map(int, match.groups())
+    return ((hours * 60 + minutes) * 60 + seconds) * 1000 + millis
+
+
+def legacy_format_timecode(ms):
+    seconds, millis = divmod(ms, 1000)
+    minutes, seconds = divmod(seconds, 60)
+    hours, minutes = divmod(minutes, 60)
+    return f"{hours:02d}:{minutes:02d}:{seconds:02d},{millis:03d}"
+
+
+def bench_timecode(args):
+    # Cues are packed tightly so a million of them stay under 100 hours,
+    # the most a two-digit legacy timestamp can express
+    rng = random.Random(0)
+    starts = []
+    position = 0
+    for _ in range(args.cues):
+        position += rng.randrange(200, 400)
+        starts.append(position)
+    ends = [start + 150 for start in starts]
+    codes = [format_timecode(ms) for ms in starts]
+    content = "\n".join(f"{n}\n{format_timecode(start)} --> {format_timecode(end)}\n字幕\n"
+                        for n, (start, end) in enumerate(zip(starts, ends), 1))
+    store = CueStore(parse_cues(content))
+    print(f"{args.cues} cues, {len(content.encode('utf-8')) / 2**20:.0f} MB")
+
+    parse = best_of(lambda: [parse_timecode(code) for code in codes], repeat=1)
+    legacy_fmt = best_of(lambda: [legacy_format_timecode(ms) for ms in starts], repeat=1)
+    fmt = best_of(lambda: [format_timecode(ms) for ms in starts], repeat=1)
+    print(f"parse {parse * 1e9 / args.cues:.0f} ns, format {legacy_fmt * 1e9 / args.cues:.0f} -> {fmt * 1e9 / args.cues:.0f} ns per timecode")
+
+    legacy_last = best_of(lambda: legacy_last_end_ms(content), repeat=1)
+    last = best_of(lambda: last_timing(content))
+    same = legacy_last_end_ms(content) == last_timing(content)[1]
+    print(f"last end time: finditer {legacy_last * 1000:.1f} ms, last_timing {last * 1e6:.1f} us, same: {'yes' if same else 'NO'}")
+
+    # From disk: read and scan the whole file vs seek to its tail
+    fd, path = tempfile.mkstemp(suffix=".srt")
+    try:
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            f.write(content)
+
+        def read_all():
+            with open(path, 'r', encoding='utf-8') as f:
+                return legacy_last_end_ms(f.read())
+
+        whole = best_of(read_all, repeat=1)
+        tail = best_of(lambda: read_last_timing(path))
+        same = read_all() == read_last_timing(path)[1]
+        print(f"last end time from file: read + finditer {whole * 1000:.1f} ms, read_last_timing {tail * 1e6:.1f} us, "
+              f"same: {'yes' if same else 'NO'}")
+    finally:
+        os.remove(path)
+
+    cues = list(store)
+    per_cue = best_of(lambda: [cue._replace(start_ms=cue.start_ms + 500, end_ms=cue.end_ms + 500) for cue in cues], repeat=1)
+    shift = best_of(lambda: store.shift(500), repeat=1)
+    scale = best_of(lambda: store.scale(25 / 23.976), repeat=1)
+    clamp = best_of(lambda: store.clamp(0, starts[-1]), repeat=1)
+    print(f"shift: per-Cue _replace {per_cue * 1000:.0f} ms, CueStore.shift {shift * 1000:.0f} ms, "
+          f"scale {scale * 1000:.0f} ms, clamp {clamp * 1000:.0f} ms")
+
+
+def measure_peak(func):
+    tracemalloc.start()
+    result = func()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return result, peak
+
+
+def bench_mmap(args):
+    # A validator pass: the latest end time and the number of multi-line cues
+    def loaded():
+        with open(path, 'r', encoding='utf-8') as f:
+            cues = CueStore(parse_cues(f.read()))
+        return cues.duration_ms, sum(1 for i in range(len(cues)) if cues.line_count(i) > 1)
+
+    def mapped():
+        with MappedTranscript(path) as transcript:
+            end = 0
+            multi = 0
+            for span in transcript.spans():
+                end = max(end, span.end_ms)
+                multi += transcript.line_count(span) > 1
+            return end, multi
+
+    content = make_transcript(args.cues, ["Dify", "Workflow", "Agent", "第二行\n"])
+    fd, path = tempfile.mkstemp(suffix=".srt")
+    try:
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            f.write(content)
+        del content
+        print(f"{args.cues} cues, {os.path.getsize(path) / 2**20:.0f} MB")
+        print("Python heap peak; mapped pages are file-backed and not counted")
+        for name, func in (("read + CueStore", loaded), ("MappedTranscript", mapped)):
+            # Timed separately: tracing slows allocations down
+            elapsed = best_of(func, repeat=1)
+            result, peak = measure_peak(func)
+            print(f"{name:>16}: {elapsed * 1000:8.0f} ms, peak {peak / 2**20:7.1f} MB, result {result}")
+    finally:
+        os.remove(path)
+
+
+def legacy_merge_file(file_path):
+    # merge_lines_in_file() of the original merge_multiline_subs.py, verbatim:
+    # the whole transcript split into blocks in memory
+    with open(file_path, 'r', encoding='utf-8') as f:
+        content = f.read()
+
+    # Normalize newlines
+    content = content.replace('\r\n', '\n').replace('\r', '\n')
+    blocks = content.split('\n\n')
+    
+    new_blocks = []
+    modified_count = 0
+    
+    for block in blocks:
+        if not block.strip():
+            continue
+            
+        lines = block.split('\n')
+        
+        # Check if first line is ID (digits) and second has timestamp
+        if len(lines) >= 3 and lines[0].strip().isdigit() and '-->' in lines[1]:
+            id_line = lines[0]
+            time_line = lines[1]
+            text_lines = lines[2:]
+            
+            # Filter out empty text lines
+            text_lines = [l.strip() for l in text_lines if l.strip()]
+            
+            if len(text_lines) > 1:
+                # Merge logic
+                merged_text = text_lines[0]
+                for next_line in text_lines[1:]:
+                    # Basic check for adding space: if both border chars are alphanumeric/ASCII
+                    need_space = False
+                    if merged_text and next_line:
+                        last_char = merged_text[-1]
+                        first_char = next_line[0]
+                        if (last_char.isascii() and last_char.isalnum()) and (first_char.isascii() and first_char.isalnum()):
+                            need_space = True
+                    
+                    if need_space:
+                        merged_text += " " + next_line
+                    else:
+                        merged_text += next_line
+                        
+                text_lines = [merged_text]
+                modified_count += 1
+            
+            new_block_lines = [id_line, time_line] + text_lines
+            new_blocks.append("\n".join(new_block_lines))
+        else:
+            # just keep as is
+            new_blocks.append(block)
+            
+    if modified_count > 0:
+        with open(file_path, 'w', encoding='utf-8') as f:
+            f.write("\n\n".join(new_blocks))
+            f.write("\n") # Ensure final newline
+            
+    return modified_count
+
+
+def bench_merge(args):
+    from merge_multiline_subs import merge_lines_in_file
+
+    # A cue whose text ends in a line break leaves two blank lines behind
+    # it. The original splits blocks on blank lines and keeps the next cue
+    # unmerged, so those are made single to compare like with like
+    content = make_transcript(args.cues, ["Dify", "Workflow", "Agent", "第二行\n"]).replace("\n\n\n", "\n\n")
+    workdir = tempfile.mkdtemp(prefix="bench_merge_")
+    try:
+        source = os.path.join(workdir, "source.srt")
+        with open(source, 'w', encoding='utf-8') as f:
+            f.write(content)
+        del content
+        print(f"{args.cues} cues, {os.path.getsize(source) / 2**20:.0f} MB")
+        print("Python heap peak while merging one file")
+        outputs = []
+        for name, func in (("in memory", legacy_merge_file), ("streaming", merge_lines_in_file)):
+            path = os.path.join(workdir, f"{name}.srt")
+            shutil.copyfile(source, path)
+            start = time.perf_counter()
+            func(path)
+            elapsed = time.perf_counter() - start
+            # Traced on a fresh copy: tracing slows allocations down
+            shutil.copyfile(source, path)
+            merged, peak = measure_peak(lambda: func(path))
+            with open(path, 'rb') as f:
+                outputs.append(f.read())
+            print(f"{name:>10}: {elapsed * 1000:8.0f} ms, peak {peak / 2**20:7.1f} MB, {merged} cues merged")
+        print(f"byte-identical output: {'yes' if outputs[0] == outputs[1] else 'NO'}")
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+# Tree benchmark: the whole-tree scripts end to end, each on a fresh copy of
+# a synthetic course. Paths are relative to the course root, which holds
+# courses.json and 課綱/ as the repository does.
+TREE_SCRIPTS = [
+    ("process_global_srt", ["process_global_srt.py", "--base-dir", "課綱"]),
+    ("check_and_fix_srt_global", ["check_and_fix_srt_global.py", "--base-dir", "課綱", "--report", "multi_line_report.md"]),
+    ("merge_multiline_subs", ["merge_multiline_subs.py", "--base-dir", "課綱"]),
+    ("generate_missing_assets", ["generate_missing_assets.py", "--base-dir", "課綱"]),
+    ("update_course_durations", ["update_course_durations.py"]),
+    ("generate_overview", ["generate_overview.py"]),
+]
+
+README_TEMPLATE = """# {title}
+
+## 學習目標
+
+完成本單元後，您將能夠：
+- 理解{title}的核心概念
+- 在 Dify 中設定{title}
+- 將{title}應用於實際專案
+
+## 內容大綱
+
+### 1. 為什麼需要{title}
+- **提升效率**：減少重複的工作
+- **降低成本**：善用現有的模型
+
+### 2. {title}的設定注意事項
+- 確認 API Key 已經設定完成
+- 先在測試環境驗證流程
+"""
+
+
+def make_course_srt(cue_count, vocabulary, sc_words, sc_ratio, multiline_ratio, rng):
+    """A unit transcript: rule keys, filler and some Simplified words, with some cues on several lines."""
+    filler = ["我們", "這邊", "可以", "設定", "然後", "就是", "流程", "今天", "模型", "一下"]
+    blocks = []
+    for n in range(1, cue_count + 1):
+        line_count = rng.choice((2, 3)) if rng.random() < multiline_ratio else 1
+        lines = []
+        for _ in range(line_count):
+            words = []
+            for _ in range(rng.randint(4, 9)):
+                roll = rng.random()
+                if roll < sc_ratio:
+                    words.append(rng.choice(sc_words))
+                elif roll < sc_ratio + 0.2:
+                    words.append(rng.choice(vocabulary))
+                else:
+                    words.append(rng.choice(filler))
+            lines.append("".join(words))
+        start = n * 3000
+        blocks.append(f"{n}\n{format_timecode(start)} --> {format_timecode(start + 2500)}\n" + "\n".join(lines) + "\n")
+    return "\n".join(blocks)
+
+
+def make_course_tree(root, chapters=6, units=10, cues=400, sc_ratio=0.05, multiline_ratio=0.2, seed=0):
+    """
+    Writes a synthetic course under root: courses.json and a 課綱/ tree of
+    chapter and unit folders, each unit with a readme.md and its
+    <chapter>-<unit>.srt. Returns the number of .srt files.
+    """
+    from check_and_fix_srt_global import SC_TO_TC_PAIRS
+    from srt_rules import profile_table
+
+    rng = random.Random(seed)
+    vocabulary = [rule[0] for rule in profile_table("review").rules]
+    sc_words = [old for old, new in SC_TO_TC_PAIRS if old != new]
+    course = {"version": "1.0.0", "title": "Dify 課程", "subtitle": "基準測試", "estimatedTotalTime": 0, "chapters": []}
+    for c in range(1, chapters + 1):
+        chapter_dir = f"{c}.第{c}章 - 基準測試"
+        chapter = {"id": f"chapter-{c}", "title": f"第{c}章", "subtitle": "基準測試", "icon": "fa-solid fa-book",
+                   "duration": 0, "units": []}
+        for u in range(1, units + 1):
+            title = f"單元主題{c}-{u}"
+            unit_dir = os.path.join(root, "課綱", chapter_dir, f"單元 {u} - {title}")
+            os.makedirs(unit_dir)
+            with open(os.path.join(unit_dir, "readme.md"), 'w', encoding='utf-8') as f:
+                f.write(README_TEMPLATE.format(title=title))
+            with open(os.path.join(unit_dir, f"{c}-{u}.srt"), 'w', encoding='utf-8') as f:
+                f.write(make_course_srt(cues, vocabulary, sc_words, sc_ratio, multiline_ratio, rng))
+            chapter["units"].append({"id": f"unit-{c}-{u}", "title": title, "duration": 0,
+                                     "contentPath": f"課綱/{chapter_dir}/單元 {u} - {title}/readme.md"})
+        course["chapters"].append(chapter)
+    with open(os.path.join(root, "courses.json"), 'w', encoding='utf-8') as f:
+        json.dump(course, f, indent=4, ensure_ascii=False)
+    return chapters * units
+
+
+def git_revision():
+    """(short commit, whether tracked files differ from it), or ("unknown", False) outside git."""
+    try:
+        commit = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=HERE, capture_output=True,
+                                text=True, check=True).stdout.strip()
+        status = subprocess.run(["git", "status", "--porcelain", "--untracked-files=no"], cwd=HERE,
+                                capture_output=True, text=True, check=True).stdout
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown", False
+    return commit, bool(status.strip())
+
+
+def run_script(argv, cwd, cache_dir):
+    """Seconds one script takes, from interpreter start to exit."""
+    command = [sys.executable, os.path.join(HERE, argv[0]), *argv[1:]]
+    # UTF-8 output, so scripts that print emoji run the same on every console.
+    # Rule tables, manifests and indexes go to cache_dir, not the repo's .srt_cache
+    env = dict(os.environ, PYTHONIOENCODING="utf-8", SRT_CACHE_DIR=cache_dir)
+    start = time.perf_counter()
+    result = subprocess.run(command, cwd=cwd, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True)
+    elapsed = time.perf_counter() - start
+    if result.returncode != 0:
+        raise RuntimeError(f"{argv[0]} failed:\n{result.stderr}")
+    return elapsed
+
+
+def bench_tree(args):
+    config = {"chapters": args.chapters, "units": args.units, "cues": args.cues,
+              "sc_ratio": args.sc_ratio, "multiline_ratio": args.multiline_ratio, "seed": args.seed}
+    scripts = [(name, argv) for name, argv in TREE_SCRIPTS if not args.scripts or name in args.scripts]
+    workdir = tempfile.mkdtemp(prefix="bench_tree_")
+    cache_dir = os.path.join(workdir, "cache")
+    try:
+        pristine = os.path.join(workdir, "pristine")
+        files = make_course_tree(pristine, **config)
+        size = sum(os.path.getsize(path) for path in glob.glob(os.path.join(pristine, "**", "*.srt"), recursive=True))
+        print(f"{files} files, {size / 2**20:.1f} MB of subtitles; best and median of {args.repeat} runs")
+
+        results = {}
+        for name, argv in scripts:
+            times = []
+            for n in range(args.repeat):
+                # Every run starts from the untouched tree, on a new path, so
+                # without a manifest or index
+                copy = os.path.join(workdir, f"run-{name}-{n}")
+                shutil.copytree(pristine, copy)
+                times.append(run_script(argv, copy, cache_dir))
+                shutil.rmtree(copy)
+            results[name] = {"best": round(min(times), 4), "median": round(statistics.median(times), 4),
+                             "runs": [round(t, 4) for t in times]}
+            print(f"{name:>26}: best {min(times) * 1000:8.0f} ms, median {statistics.median(times) * 1000:8.0f} ms")
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    commit, dirty = git_revision()
+    entry = {"commit": commit, "dirty": dirty, "time": time.strftime("%Y-%m-%dT%H:%M:%S"),
+             "python": sys.version.split()[0], "config": config, "results": results}
+    if args.save:
+        with open(args.results, 'a', encoding='utf-8') as f:
+            f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+        print(f"saved as {commit}{' (uncommitted changes)' if dirty else ''} in {args.results}")
+
+
+def load_results(path):
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return [json.loads(line) for line in f if line.strip()]
+    except FileNotFoundError:
+        return []
+
+
+def bench_compare(args):
+    entries = load_results(args.results)
+    if not entries:
+        sys.exit(f"no results in {args.results}; run `bench_srt.py tree --save` first")
+
+    def latest(commit, config=None):
+        for entry in reversed(entries):
+            if entry["commit"].startswith(commit) and (config is None or entry["config"] == config):
+                return entry
+        sys.exit(f"no results for {commit}" + (" with the same tree settings" if config else ""))
+
+    head = latest(args.head) if args.head else entries[-1]
+    if args.base:
+        base = latest(args.base, head["config"])
+    else:
+        # The latest run of another commit on the same tree
+        older = [e for e in entries if e["config"] == head["config"] and e["commit"] != head["commit"]]
+        if not older:
+            sys.exit(f"no other commit has results for the tree settings of {head['commit']}")
+        base = older[-1]
+
+    print(f"{base['commit']} -> {head['commit']}{' (uncommitted changes)' if head['dirty'] else ''}, best of each")
+    regressions = 0
+    for name, result in head["results"].items():
+        if name not in base["results"]:
+            continue
+        before = base["results"][name]["best"]
+        after = result["best"]
+        change = after / before - 1
+        flag = ""
+        if change > args.threshold:
+            flag = "  SLOWER"
+            regressions += 1
+        elif change < -args.threshold:
+            flag = "  faster"
+        print(f"{name:>26}: {before * 1000:8.0f} -> {after * 1000:8.0f} ms {change:+7.1%}{flag}")
+    if regressions:
+        sys.exit(1)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    replace = commands.add_parser("replace", help="term-correction rules: sequential replace vs single pass")
+    replace.add_argument("--sizes", type=int, nargs="+", default=[100, 1000, 10000])
+    replace.set_defaults(func=bench_replace)
+
+    sc2tc = commands.add_parser("sc2tc", help="SC->TC conversion: per-entry replace vs translate fast path")
+    sc2tc.add_argument("--base-dir", default=DEFAULT_BASE_DIR)
+    sc2tc.set_defaults(func=bench_sc2tc)
+
+    cuestore = commands.add_parser("cuestore", help="memory per cue: list of Cue records vs CueStore")
+    cuestore.add_argument("--sizes", type=int, nargs="+", default=[1000, 100000])
+    cuestore.set_defaults(func=bench_cuestore)
+
+    split = commands.add_parser("split", help="line breaking of long merged cues: legacy split_text vs srt_text")
+    split.add_argument("--lengths", type=int, nargs="+", default=[40, 200, 2000, 20000])
+    split.add_argument("--base-dir", default=DEFAULT_BASE_DIR)
+    split.set_defaults(func=bench_split)
+
+    timecode = commands.add_parser("timecode", help="timecode parsing, formatting and whole-column retiming")
+    timecode.add_argument("--cues", type=int, default=1000000)
+    timecode.set_defaults(func=bench_timecode)
+
+    mapped = commands.add_parser("mmap", help="validator pass over a huge file: loaded text vs memory-mapped bytes")
+    mapped.add_argument("--cues", type=int, default=1000000)
+    mapped.set_defaults(func=bench_mmap)
+
+    merge = commands.add_parser("merge", help="merging multi-line cues in a huge file: in memory vs streaming")
+    merge.add_argument("--cues", type=int, default=1000000)
+    merge.set_defaults(func=bench_merge)
+
+    tree = commands.add_parser("tree", help="whole-tree scripts end to end on a synthetic course; --save records the results per commit")
+    tree.add_argument("--chapters", type=int, default=6)
+    tree.add_argument("--units", type=int, default=10, help="units per chapter")
+    tree.add_argument("--cues", type=int, default=400, help="cues per unit transcript")
+    tree.add_argument("--sc-ratio", type=float, default=0.05, help="share of words in Simplified Chinese")
+    tree.add_argument("--multiline-ratio", type=float, default=0.2, help="share of cues with several lines")
+    tree.add_argument("--seed", type=int, default=0)
+    tree.add_argument("--repeat", type=int, default=3)
+    tree.add_argument("--scripts", nargs="+", choices=[name for name, _ in TREE_SCRIPTS], help="only these scripts")
+    tree.add_argument("--results", default=RESULTS_PATH)
+    tree.add_argument("--save", action="store_true", help="record the timings in --results for `compare`")
+    tree.set_defaults(func=bench_tree)
+
+    compare = commands.add_parser("compare", help="compare recorded tree results of two commits; exits 1 on a regression")
+    compare.add_argument("base", nargs="?", help="baseline commit (default: latest other commit on the same tree)")
+    compare.add_argument("head", nargs="?", help="commit to check (default: latest results)")
+    compare.add_argument("--threshold", type=float, default=0.1, help="relative slowdown reported as a regression")
+    compare.add_argument("--results", default=RESULTS_PATH)
+    compare.set_defaults(func=bench_compare)
+
+    args = parser.parse_args()
+    args.func(args)
+
+
+if __name__ == "__main__":
+    main()
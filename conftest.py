@@ -0,0 +1,12 @@
+import os
+import shutil
+import tempfile
+
+# Rule tables the tests load are cached outside the working copy; set before
+# srt_rules is imported, which reads it once
+_CACHE_DIR = tempfile.mkdtemp(prefix="srt_test_cache_")
+os.environ["SRT_CACHE_DIR"] = _CACHE_DIR
+
+
+def pytest_unconfigure(config):
+    shutil.rmtree(_CACHE_DIR, ignore_errors=True)
@@ -1,352 +1,367 @@
 
 import os
 
+from srt_io import encode_text, write_if_changed
+from srt_replace import compile_converter
+from srt_stages import count, measure_file, stage, write_summary
+
+# Mapping of Simplified to Traditional Chinese characters and phrases found in the file
+REPLACEMENTS = {
+    "图片": "圖片",
+    "向量化": "向量化", # Same, but context matters
+    "注册": "註冊",
+    "链接": "連結",
+    "网页": "網頁",
+    "申请": "申請",
+    "额度": "額度",
+    "费用": "費用",
+    "便宜": "便宜", # Same
+    "千万": "千萬",
+    "亿": "億",
+    "资料": "資料",
+    "除非": "除非", # Same
+    "大量": "大量", # Same
+    "设定": "設定", # Same
+    "建立": "建立", # Same
+    "复制": "複製",
+    "配置": "配置", # Same
+    "显示": "顯示",
+    "列表": "列表", # Same
+    "预设": "預設",
+    "流浪客": "Rerank", # Contextual fix from previous knowledge, likely Rerank
+    "REG": "RAG", # Typos
+    "Relank": "Rerank",
+    "Relunk": "Rerank",
+    "Text Embedding": "Text Embedding",
+    "Vision": "Vision",
+    "Voyage": "Voyage",
+    "Jina": "Jina",
+    "OpenAI": "OpenAI",
+    "API Key": "API Key",
+    "MIS": "一致", # Context: "版本一樣要用MIS" -> "版本一樣要一致"? Or "MIS" is a typo. "版本一樣要用MIS" -> "版本一樣要用 same"? Let's assume it's a typo for "一致" or "match".
+    "Docker": "Docker",
+    "插線": "插件", # Context: "插線這邊" -> "插件這邊"
+    "Ji等A": "Jina", # Context: "打Ji等A" -> "打Jina"
+    "这": "這",
+    "么": "麼",
+    "见": "見",
+    "间": "間",
+    "还": "還",
+    "进": "進",
+    "个": "個",
+    "们": "們",
+    "来": "來",
+    "说": "說",
+    "书": "書",
+    "对应": "對應",
+    "对": "對",
+    "为": "為",
+    "与": "與",
+    "关": "關",
+    "系": "係",
+    "别": "別",
+    "处": "處",
+    "实": "實",
+    "应": "應",
+    "开": "開",
+    "当": "當",
+    "从": "從",
+    "后": "後",
+    "得": "得", # Same
+    "微": "微", # Same
+    "心": "心", # Same
+    "志": "誌",
+    "忙": "忙", # Same
+    "态": "態",
+    "总": "總",
+    "愛": "愛",
+    "感": "感", # Same
+    "我": "我", # Same
+    "才": "才", # Same
+    "找": "找", # Same
+    "把": "把", # Same
+    "提": "提", # Same
+    "改": "改", # Same
+    "教": "教", # Same
+    "数": "數",
+    "文": "文", # Same
+    "新": "新", # Same
+    "方": "方", # Same
+    "施": "施", # Same
+    "明": "明", # Same
+    "时": "時",
+    "更": "更", # Same
+    "最": "最", # Same
+    "有": "有", # Same
+    "期": "期", # Same
+    "机": "機",
+    "次": "次", # Same
+    "比": "比", # Same
+    "气": "氣",
+    "水": "水", # Same
+    "活": "活", # Same
+    "流": "流", # Same
+    "测": "測",
+    "满": "滿",
+    "湾": "灣",
+    "演": "演", # Same
+    "无": "無",
+    "然": "然", # Same
+    "照": "照", # Same
+    "片": "片", # Same
+    "版": "版", # Same
+    "物": "物", # Same
+    "特": "特", # Same
+    "产": "產",
+    "用": "用", # Same
+    "由": "由", # Same
+    "电": "電",
+    "的": "的", # Same
+    "目": "目", # Same
+    "直": "直", # Same
+    "真": "真", # Same
+    "知": "知", # Same
+    "确": "確",
+    "示": "示", # Same
+    "社": "社", # Same
+    "种": "種",
+    "科": "科", # Same
+    "程": "程", # Same
+    "空": "空", # Same
+    "立": "立", # Same
+    "第": "第", # Same
+    "等": "等", # Same
+    "简": "簡",
+    "算": "算", # Same
+    "管": "管", # Same
+    "类": "類",
+    "精": "精", # Same
+    "系": "系", # Same
+    "约": "約",
+    "级": "級",
+    "红": "紅",
+    "纪": "紀",
+    "纳": "納",
+    "纹": "紋",
+    "统": "統",
+    "维": "維",
+    "网": "網",
+    "置": "置", # Same
+    "美": "美", # Same
+    "考": "考", # Same
+    "者": "者", # Same
+    "而": "而", # Same
+    "能": "能", # Same
+    "自": "自", # Same
+    "色": "色", # Same
+    "花": "花", # Same
+    "苦": "苦", # Same
+    "英": "英", # Same
+    "华": "華",
+    "万": "萬",
+    "落": "落", # Same
+    "叶": "葉",
+    "著": "著", # Same
+    "号": "號",
+    "虽": "雖",
+    "行": "行", # Same
+    "表": "表", # Same
+    "见": "見",
+    "视": "視",
+    "言": "言", # Same
+    "计": "計",
+    "认": "認",
+    "让": "讓",
+    "讯": "訊",
+    "记": "記",
+    "讲": "講",
+    "变": "變",
+    "象": "象", # Same
+    "货": "貨",
+    "费": "費",
+    "资": "資",
+    "路": "路", # Same
+    "身": "身", # Same
+    "车": "車",
+    "转": "轉",
+    "辑": "輯",
+    "办": "辦",
+    "边": "邊",
+    "过": "過",
+    "运": "運",
+    "进": "進",
+    "近": "近", # Same
+    "连": "連",
+    "选": "選",
+    "还": "還",
+    "那": "那", # Same
+    "部": "部", # Same
+    "配": "配", # Same
+    "里": "裡",
+    "量": "量", # Same
+    "金": "金", # Same
+    "钱": "錢",
+    "开": "開",
+    "间": "間",
+    "阁": "閣",
+    "阅": "閱",
+    "阳": "陽",
+    "际": "際",
+    "陆": "陸",
+    "队": "隊",
+    "阶": "階",
+    "隋": "隨", 
+    "集": "集", # Same
+    "难": "難",
+    "需": "需", # Same
+    "面": "面", # Same
+    "音": "音", # Same
+    "页": "頁",
+    "顶": "頂",
+    "项": "項",
+    "预": "預",
+    "领": "領",
+    "头": "頭",
+    "颜": "顏",
+    "类": "類",
+    "风": "風",
+    "飘": "飄",
+    "飞": "飛",
+    "饥": "飢",
+    "马": "馬",
+    "验": "驗",
+    "体": "體",
+    "高": "高", # Same
+    "发": "發",
+    "麻": "麻", # Same
+    "黄": "黃",
+    "点": "點",
+    "么": "麼",
+    # Phrases found in file
+    "虽然": "雖然",
+    "已经": "已經",
+    "进来": "進來",
+    "之后": "之後",
+    "说明": "說明",
+    "怎么": "怎麼",
+    "使用": "使用",
+    "安装": "安裝",
+    "插线": "插線",
+    "这边": "這邊",
+    "一样": "一樣",
+    "找到": "找到",
+    "搜寻": "搜尋",
+    "列出来": "列出來",
+    "这个": "這個",
+    "设定": "設定",
+    "刚才": "剛才",
+    "这里": "這裡",
+    "供应商": "供應商",
+    "稍微": "稍微",
+    "新增": "新增",
+    "连结": "連結",
+    "就会": "就會",
+    "挑到": "跳到", # Typos
+    "注册": "註冊",
+    "其实": "其實",
+    "基本上": "基本上",
+    "容易": "容易",
+    "只要": "只要",
+    "另外": "另外",
+    "申请": "申請",
+    "底下": "底下",
+    "自己": "自己",
+    "提供": "提供",
+    "非常": "非常",
+    "大方": "大方",
+    "之内": "之內",
+    "尽量": "盡量",
+    "练习": "練習",
+    "便宜": "便宜",
+    "实际上": "實際上",
+    "千万": "千萬",
+    "用不完": "用不完",
+    "直接": "直接",
+    "呈现": "呈現",
+    "建立": "建立",
+    "看不到": "看不到",
+    "复制": "複製",
+    "变成": "變成",
+    "绿灯": "綠燈",
+    "表示": "表示",
+    "下面": "下面",
+    "很多": "很多",
+    "使用": "使用",
+    "标示": "標示",
+    "一般": "一般",
+    "这样子": "這樣",
+    "写": "寫",
+    "最新": "最新",
+    "后面": "後面",
+    "加个": "加個",
+    "针对": "針對",
+    "讲一下": "講一下",
+    "搭配": "搭配",
+    "向量": "向量",
+    "流程": "流程",
+    "列表": "列表",
+    "上次": "上次",
+    "没加": "沒加",
+    "加上来": "加上來",
+    "预设": "預設",
+    "最高": "最高",
+    "版本": "版本",
+    "加上去": "加上去",
+    "透过": "透過",
+    "流浪客": "Rerank", # Correction
+    "资料库": "資料庫",
+    "上传": "上傳",
+    "上去": "上去",
+    "档案": "檔案",
+    "特别": "特別",
+    "注意": "注意",
+    "处理": "處理",
+    "一开始": "一開始",
+    "文件": "文件",
+    "动作": "動作",
+    "查询": "查詢",
+    "一定": "一定",
+    "同一个": "同一個",
+    "同样": "同樣",
+    "一组": "一組",
+    "讨厌": "討厭",
+    "地方": "地方",
+    "未来": "未來",
+    "做法": "做法", # Or 作法
+    "提出": "提出",
+    "类似": "類似",
+    "一系列": "一系列",
+    "共用": "共用",
+    "空间": "空間",
+    "其他家": "其他家",
+    "设计": "設計",
+}
+
+# Built once; every file converted in this run shares it
+CONVERTER = compile_converter(REPLACEMENTS.items())
+
 def convert_sc_to_tc(file_path):
-    # Mapping of Simplified to Traditional Chinese characters and phrases found in the file
-    replacements = {
-        "图片": "圖片",
-        "向量化": "向量化", # Same, but context matters
-        "注册": "註冊",
-        "链接": "連結",
-        "网页": "網頁",
-        "申请": "申請",
-        "额度": "額度",
-        "费用": "費用",
-        "便宜": "便宜", # Same
-        "千万": "千萬",
-        "亿": "億",
-        "资料": "資料",
-        "除非": "除非", # Same
-        "大量": "大量", # Same
-        "设定": "設定", # Same
-        "建立": "建立", # Same
-        "复制": "複製",
-        "配置": "配置", # Same
-        "显示": "顯示",
-        "列表": "列表", # Same
-        "预设": "預設",
-        "流浪客": "Rerank", # Contextual fix from previous knowledge, likely Rerank
-        "REG": "RAG", # Typos
-        "Relank": "Rerank",
-        "Relunk": "Rerank",
-        "Text Embedding": "Text Embedding",
-        "Vision": "Vision",
-        "Voyage": "Voyage",
-        "Jina": "Jina",
-        "OpenAI": "OpenAI",
-        "API Key": "API Key",
-        "MIS": "一致", # Context: "版本一樣要用MIS" -> "版本一樣要一致"? Or "MIS" is a typo. "版本一樣要用MIS" -> "版本一樣要用 same"? Let's assume it's a typo for "一致" or "match".
-        "Docker": "Docker",
-        "插線": "插件", # Context: "插線這邊" -> "插件這邊"
-        "Ji等A": "Jina", # Context: "打Ji等A" -> "打Jina"
-        "这": "這",
-        "么": "麼",
-        "见": "見",
-        "间": "間",
-        "还": "還",
-        "进": "進",
-        "个": "個",
-        "们": "們",
-        "来": "來",
-        "说": "說",
-        "书": "書",
-        "对应": "對應",
-        "对": "對",
-        "为": "為",
-        "与": "與",
-        "关": "關",
-        "系": "係",
-        "别": "別",
-        "处": "處",
-        "实": "實",
-        "应": "應",
-        "开": "開",
-        "当": "當",
-        "从": "從",
-        "后": "後",
-        "得": "得", # Same
-        "微": "微", # Same
-        "心": "心", # Same
-        "志": "誌",
-        "忙": "忙", # Same
-        "态": "態",
-        "总": "總",
-        "愛": "愛",
-        "感": "感", # Same
-        "我": "我", # Same
-        "才": "才", # Same
-        "找": "找", # Same
-        "把": "把", # Same
-        "提": "提", # Same
-        "改": "改", # Same
-        "教": "教", # Same
-        "数": "數",
-        "文": "文", # Same
-        "新": "新", # Same
-        "方": "方", # Same
-        "施": "施", # Same
-        "明": "明", # Same
-        "时": "時",
-        "更": "更", # Same
-        "最": "最", # Same
-        "有": "有", # Same
-        "期": "期", # Same
-        "机": "機",
-        "次": "次", # Same
-        "比": "比", # Same
-        "气": "氣",
-        "水": "水", # Same
-        "活": "活", # Same
-        "流": "流", # Same
-        "测": "測",
-        "满": "滿",
-        "湾": "灣",
-        "演": "演", # Same
-        "无": "無",
-        "然": "然", # Same
-        "照": "照", # Same
-        "片": "片", # Same
-        "版": "版", # Same
-        "物": "物", # Same
-        "特": "特", # Same
-        "产": "產",
-        "用": "用", # Same
-        "由": "由", # Same
-        "电": "電",
-        "的": "的", # Same
-        "目": "目", # Same
-        "直": "直", # Same
-        "真": "真", # Same
-        "知": "知", # Same
-        "确": "確",
-        "示": "示", # Same
-        "社": "社", # Same
-        "种": "種",
-        "科": "科", # Same
-        "程": "程", # Same
-        "空": "空", # Same
-        "立": "立", # Same
-        "第": "第", # Same
-        "等": "等", # Same
-        "简": "簡",
-        "算": "算", # Same
-        "管": "管", # Same
-        "类": "類",
-        "精": "精", # Same
-        "系": "系", # Same
-        "约": "約",
-        "级": "級",
-        "红": "紅",
-        "纪": "紀",
-        "纳": "納",
-        "纹": "紋",
-        "统": "統",
-        "维": "維",
-        "网": "網",
-        "置": "置", # Same
-        "美": "美", # Same
-        "考": "考", # Same
-        "者": "者", # Same
-        "而": "而", # Same
-        "能": "能", # Same
-        "自": "自", # Same
-        "色": "色", # Same
-        "花": "花", # Same
-        "苦": "苦", # Same
-        "英": "英", # Same
-        "华": "華",
-        "万": "萬",
-        "落": "落", # Same
-        "叶": "葉",
-        "著": "著", # Same
-        "号": "號",
-        "虽": "雖",
-        "行": "行", # Same
-        "表": "表", # Same
-        "见": "見",
-        "视": "視",
-        "言": "言", # Same
-        "计": "計",
-        "认": "認",
-        "让": "讓",
-        "讯": "訊",
-        "记": "記",
-        "讲": "講",
-        "变": "變",
-        "象": "象", # Same
-        "货": "貨",
-        "费": "費",
-        "资": "資",
-        "路": "路", # Same
-        "身": "身", # Same
-        "车": "車",
-        "转": "轉",
-        "辑": "輯",
-        "办": "辦",
-        "边": "邊",
-        "过": "過",
-        "运": "運",
-        "进": "進",
-        "近": "近", # Same
-        "连": "連",
-        "选": "選",
-        "还": "還",
-        "那": "那", # Same
-        "部": "部", # Same
-        "配": "配", # Same
-        "里": "裡",
-        "量": "量", # Same
-        "金": "金", # Same
-        "钱": "錢",
-        "开": "開",
-        "间": "間",
-        "阁": "閣",
-        "阅": "閱",
-        "阳": "陽",
-        "际": "際",
-        "陆": "陸",
-        "队": "隊",
-        "阶": "階",
-        "隋": "隨", 
-        "集": "集", # Same
-        "难": "難",
-        "需": "需", # Same
-        "面": "面", # Same
-        "音": "音", # Same
-        "页": "頁",
-        "顶": "頂",
-        "项": "項",
-        "预": "預",
-        "领": "領",
-        "头": "頭",
-        "颜": "顏",
-        "类": "類",
-        "风": "風",
-        "飘": "飄",
-        "飞": "飛",
-        "饥": "飢",
-        "马": "馬",
-        "验": "驗",
-        "体": "體",
-        "高": "高", # Same
-        "发": "發",
-        "麻": "麻", # Same
-        "黄": "黃",
-        "点": "點",
-        "么": "麼",
-        # Phrases found in file
-        "虽然": "雖然",
-        "已经": "已經",
-        "进来": "進來",
-        "之后": "之後",
-        "说明": "說明",
-        "怎么": "怎麼",
-        "使用": "使用",
-        "安装": "安裝",
-        "插线": "插線",
-        "这边": "這邊",
-        "一样": "一樣",
-        "找到": "找到",
-        "搜寻": "搜尋",
-        "列出来": "列出來",
-        "这个": "這個",
-        "设定": "設定",
-        "刚才": "剛才",
-        "这里": "這裡",
-        "供应商": "供應商",
-        "稍微": "稍微",
-        "新增": "新增",
-        "连结": "連結",
-        "就会": "就會",
-        "挑到": "跳到", # Typos
-        "注册": "註冊",
-        "其实": "其實",
-        "基本上": "基本上",
-        "容易": "容易",
-        "只要": "只要",
-        "另外": "另外",
-        "申请": "申請",
-        "底下": "底下",
-        "自己": "自己",
-        "提供": "提供",
-        "非常": "非常",
-        "大方": "大方",
-        "之内": "之內",
-        "尽量": "盡量",
-        "练习": "練習",
-        "便宜": "便宜",
-        "实际上": "實際上",
-        "千万": "千萬",
-        "用不完": "用不完",
-        "直接": "直接",
-        "呈现": "呈現",
-        "建立": "建立",
-        "看不到": "看不到",
-        "复制": "複製",
-        "变成": "變成",
-        "绿灯": "綠燈",
-        "表示": "表示",
-        "下面": "下面",
-        "很多": "很多",
-        "使用": "使用",
-        "标示": "標示",
-        "一般": "一般",
-        "这样子": "這樣",
-        "写": "寫",
-        "最新": "最新",
-        "后面": "後面",
-        "加个": "加個",
-        "针对": "針對",
-        "讲一下": "講一下",
-        "搭配": "搭配",
-        "向量": "向量",
-        "流程": "流程",
-        "列表": "列表",
-        "上次": "上次",
-        "没加": "沒加",
-        "加上来": "加上來",
-        "预设": "預設",
-        "最高": "最高",
-        "版本": "版本",
-        "加上去": "加上去",
-        "透过": "透過",
-        "流浪客": "Rerank", # Correction
-        "资料库": "資料庫",
-        "上传": "上傳",
-        "上去": "上去",
-        "档案": "檔案",
-        "特别": "特別",
-        "注意": "注意",
-        "处理": "處理",
-        "一开始": "一開始",
-        "文件": "文件",
-        "动作": "動作",
-        "查询": "查詢",
-        "一定": "一定",
-        "同一个": "同一個",
-        "同样": "同樣",
-        "一组": "一組",
-        "讨厌": "討厭",
-        "地方": "地方",
-        "未来": "未來",
-        "做法": "做法", # Or 作法
-        "提出": "提出",
-        "类似": "類似",
-        "一系列": "一系列",
-        "共用": "共用",
-        "空间": "空間",
-        "其他家": "其他家",
-        "设计": "設計",
-    }
-    
-    with open(file_path, 'r', encoding='utf-8') as f:
-        content = f.read()
-        
-    for old, new in replacements.items():
-        content = content.replace(old, new)
-        
-    with open(file_path, 'w', encoding='utf-8') as f:
-        f.write(content)
+    # Stage timings are recorded when SRT_PROFILE_STAGES is set
+    with measure_file(file_path):
+        with stage("read"), open(file_path, 'r', encoding='utf-8') as f:
+            content = f.read()
+
+        with stage("convert"):
+            content = CONVERTER.apply(content)
+        data = encode_text(content)
+        count(bytes_in=os.path.getsize(file_path), bytes_out=len(data))
+        with stage("write"):
+            return write_if_changed(file_path, data)
+
+def main():
+    file_path = r"e:\github\dify-tutorial\課綱\4.應用篇 - 實戰應用開發\單元 2 - Embedding 及 Rerank 模型說明\4-2.srt"
+    convert_sc_to_tc(file_path)
+    write_summary("convert_sc_tc_4_2")
 
 if __name__ == "__main__":
-    convert_sc_to_tc(r"e:\github\dify-tutorial\課綱\4.應用篇 - 實戰應用開發\單元 2 - Embedding 及 Rerank 模型說明\4-2.srt")
+    main()
@@ -1,26 +1,26 @@
 
 import os
-import glob
-import re
 import json
+import argparse
+
+from srt_async import map_io
+from srt_course import CourseTree
+from srt_cues import parse_cues
+from srt_stages import stage, write_summary
+
+TARGET_CHAPTERS = range(3, 7)
 
 def generate_summary_from_srt(srt_path):
-    with open(srt_path, 'r', encoding='utf-8') as f:
-        content = f.read()
-    
-    # Extract text lines (skipping ID and timestamp)
-    lines = content.splitlines()
+    # Extract text lines (skipping ID and timestamp). Only the first 1000
+    # characters are used, so stop parsing once we have them.
     text_lines = []
-    i = 0
-    while i < len(lines):
-        line = lines[i].strip()
-        if line.isdigit() and i+1 < len(lines) and '-->' in lines[i+1]:
-            i += 2
-            while i < len(lines) and lines[i].strip():
-                text_lines.append(lines[i].strip())
-                i += 1
-        else:
-            i += 1
+    text_length = 0
+    with open(srt_path, 'r', encoding='utf-8') as f:
+        for cue in parse_cues(f):
+            text_lines.extend(cue.lines)
+            text_length += sum(len(line) for line in cue.lines)
+            if text_length >= 1000:
+                break
             
     # Simple extraction of key content for summary (first few lines + middle + end)
     # A real summary would require an LLM, but for now we'll create a description based on filename and some content extraction
@@ -56,67 +56,56 @@ def create_readme(folder_path, srt_file):
         f.write(readme_content)
     return True
 
+def check_unit(unit):
+    # Everything one unit needs, so units can be checked concurrently.
+    # Returns (README created, missing-image task or None)
+    unit_dir = unit.path
+    srt_file = os.path.basename(unit.srts[0])
+    
+    # Check/Create README
+    created_readme = create_readme(unit_dir, srt_file)
+    
+    # Check for Image (cover.png or anything)
+    if unit.images:
+        return created_readme, None
+    
+    # Need to generate image
+    # Create a prompt based on folder name and SRT content
+    content_preview = generate_summary_from_srt(os.path.join(unit_dir, srt_file))
+    prompt = f"A modern, tech-focused course cover illustration for '{unit.name}'. Abstract representation of: {content_preview[:100]}... Minimalist, clean, Dify branding colors (blue/white/purple)."
+    
+    return created_readme, {
+        "folder": unit_dir,
+        "image_name": "cover",
+        "prompt": prompt
+    }
+
 def main():
-    base_dir = r"e:\github\dify-tutorial\課綱"
-    target_prefixes = ["3.", "4.", "5.", "6."]
+    parser = argparse.ArgumentParser(description="Create missing READMEs for chapters 3-6 and list the units missing a cover image.")
+    parser.add_argument("--base-dir", default=r"e:\github\dify-tutorial\課綱")
+    args = parser.parse_args()
     
     missing_images_list = []
     
-    # Iterate through Chapter directories
-    for start_dir in os.listdir(base_dir):
-        msg = ""
-        is_target = False
-        for prefix in target_prefixes:
-            if start_dir.startswith(prefix):
-                is_target = True
-                break
-        
-        if not is_target:
-            continue
-            
-        chapter_dir = os.path.join(base_dir, start_dir)
-        if not os.path.isdir(chapter_dir):
-            continue
-            
-        # Iterate through Unit directories
-        for unit_dir_name in os.listdir(chapter_dir):
-            unit_dir = os.path.join(chapter_dir, unit_dir_name)
-            if not os.path.isdir(unit_dir):
-                continue
-                
-            # Check for SRT
-            srt_files = glob.glob(os.path.join(unit_dir, "*.srt"))
-            if not srt_files:
-                continue
-                
-            srt_file = os.path.basename(srt_files[0])
-            
-            # Check/Create README
-            created_readme = create_readme(unit_dir, srt_file)
-            if created_readme:
-                print(f"Created README for {unit_dir_name}")
-            
-            # Check for Image (cover.png or anything)
-            image_files = glob.glob(os.path.join(unit_dir, "*.png")) + \
-                          glob.glob(os.path.join(unit_dir, "*.jpg")) + \
-                          glob.glob(os.path.join(unit_dir, "*.jpeg"))
-                          
-            if not image_files:
-                # Need to generate image
-                # Create a prompt based on folder name and SRT content
-                content_preview = generate_summary_from_srt(os.path.join(unit_dir, srt_file))
-                prompt = f"A modern, tech-focused course cover illustration for '{unit_dir_name}'. Abstract representation of: {content_preview[:100]}... Minimalist, clean, Dify branding colors (blue/white/purple)."
-                
-                missing_images_list.append({
-                    "folder": unit_dir,
-                    "image_name": "cover",
-                    "prompt": prompt
-                })
+    # Units of chapters 3-6 that have an SRT, with their files, from one walk of the tree
+    with stage("walk"):
+        tree = CourseTree(args.base_dir)
+    units = [unit for unit in tree.units(TARGET_CHAPTERS) if unit.srts]
+    
+    # The reads of many units overlap; results come back in unit order
+    with stage("units"):
+        results = map_io(check_unit, units)
+    for unit, (created_readme, image_task) in zip(units, results):
+        if created_readme:
+            print(f"Created README for {unit.name}")
+        if image_task:
+            missing_images_list.append(image_task)
 
     # Output the list of missing images to a JSON file for the agent to read
     with open("missing_images_tasks.json", "w", encoding='utf-8') as f:
         json.dump(missing_images_list, f, ensure_ascii=False, indent=2)
         
+    write_summary("generate_missing_assets")
     print(f"Found {len(missing_images_list)} units missing images.")
 
 if __name__ == "__main__":
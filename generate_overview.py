@@ -10,6 +10,9 @@ import re
 import sys
 import io
 
+from srt_async import map_io
+from srt_stages import stage, write_summary
+
 # Set stdout to utf-8 to handle emojis on Windows
 sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8')
 
@@ -60,7 +63,7 @@ def extract_key_points(content):
     return key_points[:3]  # 最多取3個關鍵點
 
 def generate_detailed_overview(unit_title, readme_path, duration):
-    """生成詳細的單元概覽（至少100字）"""
+    """生成詳細的單元概覽（至少100字），回傳 (概覽, 錯誤訊息或 None)"""
     
     if not os.path.exists(readme_path):
         # 為準備中的課程生成更詳細的描述
@@ -68,7 +71,7 @@ def generate_detailed_overview(unit_title, readme_path, duration):
                 f"🎯 **學習內容**：課程將涵蓋{unit_title}的基本原理、實作技巧以及最佳實踐。透過循序漸進的講解，"
                 f"您將了解如何在 Dify 平台上有效運用{unit_title}相關功能，並學習業界常用的開發模式與技巧。\n\n"
                 f"✅ **學習成果**：完成本單元後，您將能夠獨立完成{unit_title}的相關操作，並能夠將所學知識應用於實際專案開發中。"
-                f"這將為您後續的進階學習奠定堅實的基礎。")
+                f"這將為您後續的進階學習奠定堅實的基礎。"), None
     
     try:
         with open(readme_path, 'r', encoding='utf-8') as f:
@@ -157,11 +160,11 @@ def generate_detailed_overview(unit_title, readme_path, duration):
             # 補充通用結尾
             full_overview += f"透過循序漸進的講解與實作練習，您將能夠完全掌握{unit_title}的精髓，為後續的進階課程打下堅實基礎。"
         
-        return full_overview
+        return full_overview, None
         
     except Exception as e:
-        print(f"Error processing {readme_path}: {e}")
-        return f"本單元將探討{unit_title}的核心概念與實作技巧。課程內容豐富，包含理論講解、實務演練及案例分析，幫助您循序漸進地掌握這個主題，並能夠在實際工作中靈活運用。"
+        # 在工作執行緒中執行：錯誤交由 main() 依單元順序輸出
+        return f"本單元將探討{unit_title}的核心概念與實作技巧。課程內容豐富，包含理論講解、實務演練及案例分析，幫助您循序漸進地掌握這個主題，並能夠在實際工作中靈活運用。", f"Error processing {readme_path}: {e}"
 
 def main():
     # 讀取 courses.json
@@ -176,6 +179,19 @@ def main():
         f.write("> 每個單元的詳細學習指南，包含學習內容、關鍵難點與學習成果\n\n")
         f.write("---\n\n")
         
+        # Every README is read and summarized up front, many at once;
+        # overviews come back in unit order
+        units = [unit for chapter in courses['chapters'] for unit in chapter['units']]
+        with stage("readmes"):
+            overviews = iter(map_io(
+                lambda unit: generate_detailed_overview(
+                    unit['title'],
+                    unit['contentPath'].replace('/', os.sep),
+                    unit['duration']
+                ),
+                units
+            ))
+        
         chapter_num = 0
         for chapter in courses['chapters']:
             chapter_num += 1
@@ -190,12 +206,9 @@ def main():
             unit_num = 0
             for unit in chapter['units']:
                 unit_num += 1
-                content_path = unit['contentPath'].replace('/', os.sep)
-                overview = generate_detailed_overview(
-                    unit['title'], 
-                    content_path,
-                    unit['duration']
-                )
+                overview, error = next(overviews)
+                if error:
+                    print(error)
                 
                 f.write(f"### {chapter_num}.{unit_num} {unit['title']}\n\n")
                 f.write(f"{overview}\n\n")
@@ -209,6 +222,7 @@ def main():
         f.write("\n---\n\n")
         f.write("*本課程概覽由系統自動生成，如有疑問請參考各單元詳細內容*\n")
     
+    write_summary("generate_overview")
     print("\n✅ 詳細課程概覽已生成: COURSE_OVERVIEW.md")
     print("\n📊 統計資訊：")
     print(f"   - 總章節數: {len(courses['chapters'])}")
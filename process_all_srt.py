@@ -1,195 +0,0 @@
-
-import re
-import os
-import glob
-
-def split_text(text, max_length=20):
-    text = text.strip()
-    if len(text) <= max_length:
-        return [text]
-    
-    parts = re.split(r'([,，。、\s])', text)
-    lines = []
-    current_line = ""
-    
-    for part in parts:
-        if len(current_line) + len(part) > max_length:
-            if current_line:
-                lines.append(current_line)
-                current_line = part
-            else:
-                current_line = part
-        else:
-            current_line += part
-            
-    if current_line:
-        lines.append(current_line)
-        
-    lines = [line.strip() for line in lines if line.strip()]
-    
-    final_lines = []
-    for line in lines:
-        if len(line) <= max_length:
-            final_lines.append(line)
-        else:
-            for i in range(0, len(line), max_length):
-                final_lines.append(line[i:i+max_length])
-                
-    return final_lines
-
-def process_srt(file_path):
-    print(f"Processing: {file_path}")
-    with open(file_path, 'r', encoding='utf-8') as f:
-        content = f.read()
-
-    # Comprehensive replacement list for Chapter 3
-    replacements_list = [
-        # AI/Model Terms
-        ("Entropic", "Anthropic"),
-        ("ChairGPT", "ChatGPT"),
-        ("Gemline", "Gemini"),
-        ("Gemini", "Gemini"),
-        ("LLM", "LLM"),
-        ("4.0", "4.0"), # Context
-        ("4o", "4o"),
-        ("Token", "Token"),
-        
-        # Platforms/Tools
-        ("Libre", "Zeabur"), # User request
-        ("Github", "GitHub"),
-        ("Dhub", "GitHub"),
-        ("ESA社區", "Exa Search"),
-        ("ESA社群", "Exa Search"),
-        ("ESA Search", "Exa Search"), 
-        ("ESA", "Exa"), 
-        ("FireClaw", "Firecrawl"),
-        ("FireCore", "Firecrawl"),
-        ("FireCORE", "Firecrawl"),
-        ("FireCrawl", "Firecrawl"),
-        ("WebScraper", "Web Scraper"),
-        ("Web Scraper", "Web Scraper"),
-        ("Supabase", "Supabase"),
-        ("Replicate", "Zeabur"), # Careful here. In 3-1 user asked Libre->Zeabur. 
-                                 # In 3-1 text had "Replicate" which I changed to "Zeabur" per user request on that specific file.
-                                 # User said "Use same rules". So Replicate -> Zeabur might be the rule for "Libre" mistakes?
-                                 # Actually in 3-1 step, I changed "Replicate" to "Zeabur". 
-                                 # I will stick to "Libre" -> "Zeabur" and "Replicate" -> "Zeabur" if the context implies the hosting/model provider being discussed in that specific way.
-                                 # However, simply replacing Replicate might be dangerous if they are actually talking about Replicate.com.
-                                 # But given the user's explicit instruction in step 16 ("Libre 改成Zeabur") and my subsequent action replacing "Replicate" (because the text actually said Replicate where Libre was expected? No, in 3-1 I found "Replicate" lines and replaced them).
-                                 # Let's keep Replicate -> Zeabur for consistency with user's previous preference, assuming the speaker meant Zeabur or the user wants it to be Zeabur.
-        ("Replicate", "Zeabur"), 
-        
-        # Dify Terms
-        ("DG 觀光", "Dify 官方"),
-        ("DG", "Dify"),
-        ("Dg", "Dify"),
-        ("Dify", "Dify"),
-        ("Aging", "Agent"),
-        ("Agent", "Agent"),
-        ("Workflow", "Workflow"), 
-        ("WorkFlow", "Workflow"),
-        ("ChatFlow", "Chatflow"),
-        ("ChaFlow", "Chatflow"),
-        ("WORKFLOW", "Workflow"),
-        ("Function calling", "Function Calling"),
-        ("Knowledge Retrieval", "Knowledge Retrieval"),
-        ("Question Classifier", "Question Classifier"),
-        ("If/Else", "If/Else"),
-        ("Variable Aggregator", "Variable Aggregator"),
-        ("Parameter Extractor", "Parameter Extractor"),
-        ("HTTP Request", "HTTP Request"),
-        
-        # General Corrections
-        ("每一緊張升高", "美伊緊張升高"),
-        ("一分訂好", "一旦定好"),
-        ("s我們", "我們"),
-        ("觀光", "官方"), 
-        ("接取", "擷取"),
-        ("Start", "Start"),
-        ("End", "End"),
-        ("Answer", "Answer"),
-        ("Code", "Code"),
-        ("Template", "Template"),
-        ("Iteration", "Iteration"),
-        ("Tool", "Tool"),
-    ]
-    
-    # Sort by length to avoid generic replacements matching inside specific ones
-    replacements_list.sort(key=lambda x: len(x[0]), reverse=True)
-    
-    for old, new in replacements_list:
-        content = content.replace(old, new)
-        
-    lines = content.splitlines()
-    new_lines_content = []
-    
-    i = 0
-    while i < len(lines):
-        line = lines[i].strip()
-        
-        # SRT Parsing logic
-        is_index = line.isdigit()
-        
-        # Peek next line to confirm it's a timecode (index validation)
-        is_valid_index = False
-        if is_index:
-            if i + 1 < len(lines) and '-->' in lines[i+1]:
-                is_valid_index = True
-        
-        if is_valid_index:
-            new_lines_content.append(line) # Index
-            i += 1
-            if i < len(lines):
-                new_lines_content.append(lines[i].strip()) # Timecode
-                i += 1
-            continue
-        
-        # If it looks like a timecode but wasn't caught (orphan timecode), keep it? 
-        # Usually shouldn't happen if logic is correct.
-        if '-->' in line:
-             new_lines_content.append(line)
-             i += 1
-             continue
-
-        if not line:
-            new_lines_content.append("")
-            i += 1
-            continue
-            
-        # Text block collection
-        text_block = [line]
-        i += 1
-        while i < len(lines):
-            next_line = lines[i].strip()
-            if not next_line:
-                break
-            # Check if next_line is the start of a new block (Index + Timecode next)
-            if next_line.isdigit() and (i+1 < len(lines)) and ('-->' in lines[i+1]):
-                break
-            text_block.append(next_line)
-            i += 1
-            
-        full_text = " ".join(text_block)
-        processed_lines = split_text(full_text)
-        new_lines_content.extend(processed_lines)
-        
-        # Maintain block separation
-        if i < len(lines) and not lines[i].strip():
-             new_lines_content.append("")
-             i += 1
-             
-    final_content = "\n".join(new_lines_content)
-    
-    with open(file_path, 'w', encoding='utf-8') as f:
-        f.write(final_content)
-
-def main():
-    base_path = r"e:\github\dify-tutorial\課綱\3.基本操作篇 - 打造第一個 AI 對話助手"
-    # Recursive search for all .srt files
-    srt_files = glob.glob(os.path.join(base_path, "**", "*.srt"), recursive=True)
-    
-    for srt_file in srt_files:
-        process_srt(srt_file)
-        
-if __name__ == "__main__":
-    main()
@@ -1,261 +1,118 @@
 
-import re
 import os
 import glob
+import argparse
 
-def split_text(text, max_length=20):
-    text = text.strip()
-    if len(text) <= max_length:
-        return [text]
-    
-    parts = re.split(r'([,，。、\s])', text)
-    lines = []
-    current_line = ""
-    
-    for part in parts:
-        if len(current_line) + len(part) > max_length:
-            if current_line:
-                lines.append(current_line)
-                current_line = part
-            else:
-                current_line = part
-        else:
-            current_line += part
-            
-    if current_line:
-        lines.append(current_line)
-        
-    lines = [line.strip() for line in lines if line.strip()]
-    
-    final_lines = []
-    for line in lines:
-        if len(line) <= max_length:
-            final_lines.append(line)
-        else:
-            for i in range(0, len(line), max_length):
-                final_lines.append(line[i:i+max_length])
-                
-    return final_lines
+from srt_fixer import rewrite_srt
+from srt_io import write_text_if_changed
+from srt_manifest import Manifest
+from srt_parallel import map_files
+from srt_report import DryRunReport
+from srt_rules import profile_names, profile_table
+from srt_stages import enable, stage, write_summary
 
-def get_replacements(file_path):
-    # Base replacements for ALL files
-    replacements = [
-        # AI/Model Terms
-        ("Entropic", "Anthropic"),
-        ("ChairGPT", "ChatGPT"),
-        ("Gemline", "Gemini"),
-        ("Gemini", "Gemini"), # Case fix if needed
-        ("LLM", "LLM"),
-        ("OpenAI", "OpenAI"),
-        ("Dall-E", "DALL-E"),
-        ("Midjourney", "Midjourney"),
-        ("Stable Diffusion", "Stable Diffusion"),
-        
-        # Tools/Platforms
-        ("Libre", "Zeabur"), # Global fix per user legacy
-        ("Github", "GitHub"),
-        ("Dhub", "GitHub"),
-        ("ESA社區", "Exa Search"),
-        ("ESA社群", "Exa Search"),
-        ("ESA Search", "Exa Search"), 
-        ("ESA", "Exa"), 
-        ("FireClaw", "Firecrawl"),
-        ("FireCore", "Firecrawl"),
-        ("FireCORE", "Firecrawl"),
-        ("FireCrawl", "Firecrawl"),
-        ("WebScraper", "Web Scraper"),
-        ("Web Scraper", "Web Scraper"),
-        ("Supabase", "Supabase"),
-        
-        # Dify / App Terms
-        ("DG 觀光", "Dify 官方"),
-        ("DG", "Dify"),
-        ("Dg", "Dify"),
-        ("Defy", "Dify"),
-        ("Dify", "Dify"),
-        ("Aging", "Agent"),
-        ("Agent", "Agent"),
-        ("Workflow", "Workflow"), 
-        ("WorkFlow", "Workflow"),
-        ("ChatFlow", "Chatflow"),
-        ("Chatbot", "Chatbot"),
-        ("Knowledge Retrieval", "Knowledge Retrieval"),
-        ("Function calling", "Function Calling"),
-        ("HTTP Request", "HTTP Request"),
-        ("RAG", "RAG"),
-        ("Context", "Context"),
-        
-        # Docker / Env
-        ("Docker Desktop", "Docker Desktop"),
-        ("Docker compose", "Docker Compose"),
-        ("Docker Compose", "Docker Compose"),
-        ("Docker", "Docker"),
-        ("docker", "Docker"), # Fix lowercase
-        ("都可", "Docker"),    # Fix typo
-        ("都科", "Docker"),    # Fix typo
-        ("WSL2", "WSL 2"),
-        ("Hyper-V", "Hyper-V"),
-        ("Linux", "Linux"),
-        ("Command Mode", "Command Prompt"),
-        ("ON的版本", "ARM 的版本"),
-        ("container", "Container"),
-        ("cmd", "cmd"),
-        
-        # Typos
-        ("每一緊張升高", "美伊緊張升高"),
-        ("一分訂好", "一旦定好"),
-        ("s我們", "我們"),
-        ("觀光", "官方"), 
-        ("接取", "擷取"),
-        ("GUI", "GUI"),
-        ("Divi", "Dify"),     # Fix typo
-        ("dify", "Dify"),     # Fix lowercase
-        ("git", "Git"),       # Fix lowercase
-        ("github", "GitHub"), # Fix lowercase
-    ]
+# Rule profile in rules/; files such as 1-1.srt get their own corrections on top
+PROFILE = "chapters-1-3"
 
-    # Context Specific: Replicate
-    # If we are in Chapter 1 (Intro), Replicate is likely the Provider.
-    # If we are in Chapter 3 (Basic Ops), "Replicate" might be the misheard "Zeabur" (based on 3-1 history), 
-    # BUT I will only replace "Libre". I will NOT replace "Replicate" to "Zeabur" automatically unless explicitly safe.
-    # The user approved plan says: "Ensure Replicate is NOT globally replaced".
-    # So I will NOT add ("Replicate", "Zeabur") to the list.
-    
-    # Sort by length
-    replacements.sort(key=lambda x: len(x[0]), reverse=True)
-    return replacements
+BASE_DIR = r"e:\github\dify-tutorial\課綱"
 
-def process_srt(file_path):
-    print(f"Processing: {file_path}")
-    with open(file_path, 'r', encoding='utf-8') as f:
-        content = f.read()
+# What each profile fixes when no --base-dir is given: its chapter, or the
+# whole course for the others
+PROFILE_DIRS = {
+    "chapters-1-3": [
+        os.path.join(BASE_DIR, "1.入門篇 - Dify 基礎入門"),
+        os.path.join(BASE_DIR, "2.環境準備篇（增加社群版安裝方式）"),
+        os.path.join(BASE_DIR, "3.基本操作篇 - 打造第一個 AI 對話助手"),
+    ],
+    "chapter-1": [os.path.join(BASE_DIR, "1.入門篇 - Dify 基礎入門", "單元 6 - 聊天助手與文字生成應用說明")],
+    "chapter-2": [os.path.join(BASE_DIR, "2.環境準備篇（增加社群版安裝方式）")],
+    "chapter-3": [os.path.join(BASE_DIR, "3.基本操作篇 - 打造第一個 AI 對話助手")],
+    "chapter-4": [os.path.join(BASE_DIR, "4.應用篇 - 實戰應用開發")],
+}
 
-    replacements = get_replacements(file_path)
-    
-    replacements = get_replacements(file_path)
-    
-    # Context Specific: dify1-1.srt
-    if "dify1-1.srt" in file_path or "1-1.srt" in file_path:
-         replacements.extend([
-             ("Cloud", "Claude"), 
-             ("QRGBT", "ChatGPT"),
-             ("Gem9", "Gemini"),
-             ("AIAGINE", "AI Agent"),
-             ("AIAGIN", "AI Agent"),
-             ("Aging", "Agent"),
-             ("AI Aging", "AI Agent"),
-             ("RLEG", "RAG"),
-             ("Haha", "Hahow"),
-             ("Trade", "Threads"),
-             ("vibcoding", "Writing Code"), 
-             ("NCP", "MCP"),
-             ("開發查檢", "開發插件"),
-             ("創接", "串接"),
-             ("7月級", "企業級"),
-             ("取寫", "學習"),
-             ("節止", "截止"),
-             ("ChairGPT", "ChatGPT"),
-         ])
-
-    # Context Specific: dify1-2.srt
-    if "dify1-2.srt" in file_path or "1-2.srt" in file_path:
-         replacements.extend([
-             ("self host", "Self-hosted"),
-             ("update", "Update"),
-             ("script", "Script"),
-             ("maintain", "Maintain"),
-             ("cover", "Cover"),
-             ("纔有", "才有"),
-             ("色情版本", "社群版本"),
-             ("剋制", "客製"),
-         ])
+def process_srt(file_path, profile=PROFILE):
+    print(f"Processing: {file_path}")
+    # Files sharing the same rule table reuse one compiled matcher
+    return rewrite_srt(profile_table(profile, file_path).replacer, file_path)
 
-    # Context Specific: dify1-3.srt
-    if "dify1-3.srt" in file_path or "1-3.srt" in file_path:
-        replacements.extend([
-            ("Context7", "Context"),
-            ("登錄", "登入"),
-        ])
+def _process_task(replacers, file_path, table_id, known_digest, balanced, split_cues, dry_run):
+    return rewrite_srt(replacers[table_id], file_path, known_digest, balanced, split_cues, dry_run)
 
-    # General misc additions
-    replacements.extend([
-        ("n8n", "n8n"),
-        ("make", "Make"),
-    ])
+def main():
+    parser = argparse.ArgumentParser(description="Fix terms and re-split subtitles with a rule profile.")
+    parser.add_argument("--base-dir", nargs="+",
+                        help="directories to fix (default: the profile's chapter, or the whole course)")
+    parser.add_argument("--profile", default=PROFILE, choices=profile_names(), help="rule profile from rules/")
+    parser.add_argument("--jobs", type=int, default=1, help="worker processes (0 = one per CPU)")
+    parser.add_argument("--force", action="store_true", help="ignore the manifest and process every file")
+    parser.add_argument("--balanced", action="store_true", help="break lines evenly instead of filling them greedily; slower, and a cue may take more lines")
+    parser.add_argument("--recue", action="store_true", help="split cues longer than two lines into separately timed cues")
+    parser.add_argument("--dry-run", action="store_true", help="write nothing; report rule hits, changed cues and a diff")
+    parser.add_argument("--report", help="write the dry-run report here instead of printing it")
+    parser.add_argument("--profile-stages", metavar="PATH", help="time each processing stage and write a JSON summary to PATH")
+    args = parser.parse_args()
+    if args.profile_stages:
+        enable(args.profile_stages)
     
-    # Sort again to ensure new additions are prioritized if longer
-    replacements.sort(key=lambda x: len(x[0]), reverse=True)
+    if not args.base_dir:
+        args.base_dir = PROFILE_DIRS.get(args.profile, [BASE_DIR])
     
-    for old, new in replacements:
-        content = content.replace(old, new)
-        
-    lines = content.splitlines()
-    new_lines_content = []
+    srt_files = []
+    for base_dir in args.base_dir:
+        srt_files.extend(glob.glob(os.path.join(base_dir, "**", "*.srt"), recursive=True))
     
-    i = 0
-    while i < len(lines):
-        line = lines[i].strip()
-        
-        is_index = line.isdigit()
-        is_valid_index = False
-        if is_index:
-            if i + 1 < len(lines) and '-->' in lines[i+1]:
-                is_valid_index = True
+    manifest = Manifest(os.path.commonpath(args.base_dir), "process_global_srt")
+    
+    # Compile each distinct rule table once; workers receive the list once at start-up
+    tables = {}
+    digests = []
+    tasks = []
+    skipped = 0
+    for srt_file in srt_files:
+        table = profile_table(args.profile, srt_file)
+        if table not in tables:
+            tables[table] = len(tables)
+            # Output depends on the line breaker and re-cueing too
+            digests.append(table.digest + (":balanced" if args.balanced else "") + (":recue" if args.recue else ""))
+        table_id = tables[table]
+        rules = digests[table_id]
         
-        if is_valid_index:
-            new_lines_content.append(line)
-            i += 1
-            if i < len(lines):
-                new_lines_content.append(lines[i].strip())
-                i += 1
+        # A dry run goes through every file, since clean files count rule hits too
+        if args.dry_run:
+            tasks.append((srt_file, table_id, None, args.balanced, args.recue, True))
             continue
-        
-        if '-->' in line:
-             new_lines_content.append(line)
-             i += 1
-             continue
-
-        if not line:
-            new_lines_content.append("")
-            i += 1
+        # Unchanged since the last run with the same rules: skip without opening it
+        if not args.force and manifest.is_current(srt_file, rules):
+            skipped += 1
             continue
-            
-        text_block = [line]
-        i += 1
-        while i < len(lines):
-            next_line = lines[i].strip()
-            if not next_line:
-                break
-            if next_line.isdigit() and (i+1 < len(lines)) and ('-->' in lines[i+1]):
-                break
-            text_block.append(next_line)
-            i += 1
-            
-        full_text = " ".join(text_block)
-        processed_lines = split_text(full_text)
-        new_lines_content.extend(processed_lines)
-        
-        if i < len(lines) and not lines[i].strip():
-             new_lines_content.append("")
-             i += 1
-             
-    final_content = "\n".join(new_lines_content)
+        known_digest = None if args.force else manifest.known_digest(srt_file, rules)
+        tasks.append((srt_file, table_id, known_digest, args.balanced, args.recue, False))
+    with stage("compile"):
+        replacers = [table.replacer for table in tables]
     
-    with open(file_path, 'w', encoding='utf-8') as f:
-        f.write(final_content)
-
-def main():
-    # Define the 3 chapter directories
-    base_dirs = [
-        r"e:\github\dify-tutorial\課綱\1.入門篇 - Dify 基礎入門",
-        r"e:\github\dify-tutorial\課綱\2.環境準備篇（增加社群版安裝方式）",
-        r"e:\github\dify-tutorial\課綱\3.基本操作篇 - 打造第一個 AI 對話助手"
-    ]
+    if args.dry_run:
+        report = DryRunReport(rule for table in tables for rule in table.rules)
+        for stats in map_files(_process_task, tasks, replacers, args.jobs):
+            report.add(stats)
+        if args.report:
+            write_text_if_changed(args.report, report.format())
+        else:
+            print(report.format(), end="")
+        write_summary("process_global_srt")
+        return
+    
+    rewritten = 0
+    bytes_written = 0
+    for task, stats in zip(tasks, map_files(_process_task, tasks, replacers, args.jobs)):
+        manifest.record(stats["file"], digests[task[1]], stats["sha256"])
+        if stats["written"]:
+            rewritten += 1
+            bytes_written += stats["written"]
+            print(f"Processed: {stats['file']} ({stats['cues']} cues, {stats['written']} bytes)")
+    manifest.save()
+    write_summary("process_global_srt")
     
-    for base_dir in base_dirs:
-        srt_files = glob.glob(os.path.join(base_dir, "**", "*.srt"), recursive=True)
-        for srt_file in srt_files:
-            process_srt(srt_file)
+    print(f"{len(tasks)} files checked, {rewritten} rewritten ({bytes_written} bytes), {skipped} unchanged files skipped.")
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,123 @@
+
+import argparse
+import sys
+from importlib import import_module
+
+from check_and_fix_srt_global import format_multi_line_report, sc_to_tc_table
+from srt_course import CourseTree
+from srt_io import write_text_if_changed
+from srt_manifest import Manifest
+from srt_parallel import map_files
+from srt_pipeline import DEFAULT_STAGES, parse_stages, rules_digest, run_file, validate_file
+from srt_rules import profile_names, profile_table
+from srt_stages import enable, stage, write_summary
+
+# Rule profile in rules/ for the "terms" stage; per-file profiles layer on top.
+# The same default as process_global_srt.py, so the default stages match it
+PROFILE = "chapters-1-3"
+
+def _run_task(shared, file_path, table_id, known_digest, pipeline, balanced):
+    converter, replacers = shared
+    return run_file(pipeline, file_path, converter, replacers[table_id], known_digest, balanced)
+
+def _validate_task(shared, file_path, table_id, pipeline, balanced):
+    converter, replacers = shared
+    return validate_file(pipeline, file_path, converter, replacers[table_id], balanced)
+
+def validate(srt_files, pipeline, tables, shared, args):
+    # Nothing is written and the manifest is left alone; each file is read
+    # only up to its first issue
+    tasks = [(srt_file, tables[profile_table(args.profile, srt_file)], pipeline, args.balanced) for srt_file in srt_files]
+    failed = 0
+    for stats in map_files(_validate_task, tasks, shared, args.jobs):
+        if stats["issues"]:
+            failed += 1
+            issue = stats["issues"][0]
+            print(f"{stats['file']}: cue {issue['id']}: {' / '.join(issue['text'])}")
+    print(f"{len(tasks)} files validated, {failed} with issues.")
+    return failed
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Run the subtitle cleanup steps as one pass over each file: read once, every stage, write once.")
+    parser.add_argument("--base-dir", default=r"e:\github\dify-tutorial\課綱")
+    parser.add_argument("--chapters", type=int, nargs="+", help="chapter numbers to process (default: all)")
+    parser.add_argument("--stages", default=",".join(DEFAULT_STAGES),
+                        help="comma-separated stages, run in this order (see srt_pipeline)")
+    parser.add_argument("--plugin", action="append", default=[], metavar="MODULE",
+                        help="import MODULE first, so the stages it registers can be used")
+    parser.add_argument("--validate", action="store_true",
+                        help="write nothing; report the first issue in each file and stop reading it there")
+    parser.add_argument("--profile", default=PROFILE, choices=profile_names(), help="rule profile from rules/")
+    parser.add_argument("--jobs", type=int, default=1, help="worker processes (0 = one per CPU)")
+    parser.add_argument("--force", action="store_true", help="ignore the manifest and process every file")
+    parser.add_argument("--balanced", action="store_true", help="break lines evenly instead of filling them greedily; slower, and a cue may take more lines")
+    parser.add_argument("--report", help="write the multi-line report of the check stage here")
+    parser.add_argument("--profile-stages", metavar="PATH", help="time each processing stage and write a JSON summary to PATH")
+    args = parser.parse_args()
+    for module in args.plugin:
+        import_module(module)
+    try:
+        pipeline = parse_stages(args.stages)
+    except ValueError as e:
+        parser.error(str(e))
+    if args.profile_stages:
+        enable(args.profile_stages)
+
+    srt_files = CourseTree(args.base_dir).srt_files(args.chapters)
+
+    # Compile each distinct rule table once; workers receive the list once at start-up
+    tables = {}
+    for srt_file in srt_files:
+        tables.setdefault(profile_table(args.profile, srt_file), len(tables))
+    with stage("compile"):
+        # The SC->TC table is only loaded when a stage uses it
+        converter = sc_to_tc_table().converter if "sc2tc" in pipeline.names else None
+        shared = (converter, [table.replacer for table in tables])
+
+    if args.validate:
+        failed = validate(srt_files, pipeline, tables, shared, args)
+        write_summary("process_pipeline")
+        sys.exit(1 if failed else 0)
+
+    manifest = Manifest(args.base_dir, "process_pipeline")
+    digests = [rules_digest(pipeline, table, args.balanced) for table in tables]
+    results = {}
+    tasks = []
+    skipped = 0
+    for srt_file in srt_files:
+        table_id = tables[profile_table(args.profile, srt_file)]
+        rules = digests[table_id]
+
+        # Unchanged since the last run with the same stages and rules: skip
+        # without opening it; its multi-line issues come from the manifest
+        if not args.force and manifest.is_current(srt_file, rules):
+            results[srt_file] = manifest.get(srt_file).get("issues", [])
+            skipped += 1
+            continue
+        known_digest = None if args.force else manifest.known_digest(srt_file, rules)
+        tasks.append((srt_file, table_id, known_digest, pipeline, args.balanced))
+
+    rewritten = 0
+    bytes_written = 0
+    for task, stats in zip(tasks, map_files(_run_task, tasks, shared, args.jobs)):
+        issues = stats["issues"]
+        if issues is None:
+            issues = manifest.get(stats["file"]).get("issues", [])
+        manifest.record(stats["file"], digests[task[1]], stats["sha256"], issues=issues)
+        results[stats["file"]] = issues
+        if stats["written"]:
+            rewritten += 1
+            bytes_written += stats["written"]
+            print(f"Processed: {stats['file']} ({stats['cues']} cues, {stats['written']} bytes)")
+    manifest.save()
+
+    if args.report and "check" in pipeline.names:
+        report = [{"file": path, "issues": results[path]} for path in srt_files if results[path]]
+        write_text_if_changed(args.report, format_multi_line_report(report))
+    write_summary("process_pipeline")
+
+    print(f"{len(tasks)} files checked, {rewritten} rewritten ({bytes_written} bytes), {skipped} unchanged files skipped.")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,53 @@
+"""
+Asyncio batch runner for the tree scripts that spend their time in many
+small reads: READMEs, subtitle heads and tails, directory listings.
+
+map_io() runs a blocking per-item function for every item in worker
+threads, through asyncio.to_thread(), on a pool of `limit` threads, so at
+most that many run at once. On a network filesystem the waits overlap
+instead of adding up. Results come back in item order, so the scripts
+print and write exactly what a serial run would.
+
+The limit defaults to SRT_IO_LIMIT from the environment, or 16. A limit
+of 1 runs the items one after another in the calling thread.
+"""
+
+import asyncio
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+ENV_VAR = "SRT_IO_LIMIT"
+DEFAULT_LIMIT = 16
+
+
+def io_limit():
+    try:
+        return max(1, int(os.environ.get(ENV_VAR, DEFAULT_LIMIT)))
+    except ValueError:
+        return DEFAULT_LIMIT
+
+
+async def _gather(func, items, limit):
+    # to_thread() runs on the loop's default executor; its size is the
+    # concurrency limit, instead of the default few threads per CPU
+    loop = asyncio.get_running_loop()
+    loop.set_default_executor(ThreadPoolExecutor(max_workers=limit))
+
+    # gather() returns results in the order of its arguments
+    return await asyncio.gather(*(asyncio.to_thread(func, item) for item in items))
+
+
+def map_io(func, items, limit=None):
+    """
+    [func(item) for item in items], with the calls spread over threads,
+    at most limit at a time. func must be safe to run concurrently and
+    should return what it has to report rather than print it, since the
+    calls interleave; the first exception it raises is raised here.
+    """
+    items = list(items)
+    if limit is None:
+        limit = io_limit()
+    limit = min(limit, len(items))
+    if limit <= 1:
+        return [func(item) for item in items]
+    return asyncio.run(_gather(func, items, limit))
@@ -0,0 +1,146 @@
+"""
+In-memory index of the course tree: chapters, their units and each unit's
+subtitle, README and image files.
+
+CourseTree walks the tree once with os.scandir and reads courses.json for
+the unit ids and titles, so tools select the files they want by chapter
+number without globbing and without testing every path they find.
+Chapters are the folders at the top of the tree named "<number>.<title>",
+units the folders inside a chapter.
+
+Unlike srt_index.SrtIndex this index is not kept on disk: it is built for
+one run and also lists READMEs and images.
+"""
+
+import json
+import os
+import re
+from typing import NamedTuple
+
+_CHAPTER_NAME = re.compile(r"(\d+)\.")
+IMAGE_EXTENSIONS = (".png", ".jpg", ".jpeg")
+
+
+class Unit(NamedTuple):
+    chapter: int
+    name: str
+    path: str
+    srts: list     # .srt files directly in the unit folder
+    readmes: list  # README.md in any case
+    images: list
+    id: str        # from courses.json, None when no unit points at the folder
+    title: str
+
+
+class Chapter(NamedTuple):
+    number: int
+    name: str
+    path: str
+    units: list
+    srts: list  # every .srt under the chapter, at any depth
+
+
+def _walk(top):
+    # (directory, subdirectory names, file names) for top and everything
+    # under it, one scandir per directory. Like os.walk(), clearing the
+    # yielded names skips those subdirectories.
+    pending = [top]
+    while pending:
+        directory = pending.pop()
+        dirs = []
+        files = []
+        try:
+            with os.scandir(directory) as entries:
+                for entry in entries:
+                    if entry.is_dir():
+                        dirs.append(entry.name)
+                    elif entry.is_file():
+                        files.append(entry.name)
+        except OSError:
+            continue
+        dirs.sort()
+        files.sort()
+        yield directory, dirs, files
+        # Depth first, so each chapter's folders come right after it
+        pending.extend(os.path.join(directory, name) for name in reversed(dirs))
+
+
+def _load_units(courses_path):
+    # Unit folder (absolute, normalized) -> (id, title) from courses.json
+    try:
+        with open(courses_path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    base = os.path.dirname(os.path.abspath(courses_path))
+    units = {}
+    for chapter in data.get('chapters', []):
+        for unit in chapter.get('units', []):
+            content_path = unit.get('contentPath')
+            if content_path:
+                folder = os.path.dirname(os.path.join(base, content_path.replace('/', os.sep)))
+                units[os.path.normcase(os.path.normpath(folder))] = (unit.get('id'), unit.get('title'))
+    return units
+
+
+class CourseTree:
+    def __init__(self, root, courses_path=None):
+        """
+        Indexes the tree under root. courses_path defaults to courses.json
+        next to root, as in the repository; a missing file only means
+        units have no ids.
+        """
+        self.root = os.path.normpath(root)
+        if courses_path is None:
+            courses_path = os.path.join(os.path.dirname(os.path.abspath(self.root)), "courses.json")
+        known_units = _load_units(courses_path)
+
+        self._chapters = {}  # number -> chapters, usually one
+        self._units = {}
+        chapter = None
+        for directory, dirs, files in _walk(self.root):
+            relative = os.path.relpath(directory, self.root)
+            parts = [] if relative == os.curdir else relative.split(os.sep)
+            if not parts:
+                continue
+
+            if len(parts) == 1:
+                match = _CHAPTER_NAME.match(parts[0])
+                if not match:
+                    # Not a chapter: nothing below it is indexed
+                    dirs.clear()
+                    continue
+                chapter = Chapter(int(match.group(1)), parts[0], directory, [], [])
+                self._chapters.setdefault(chapter.number, []).append(chapter)
+            srts = [os.path.join(directory, name) for name in files if name.lower().endswith(".srt")]
+            chapter.srts.extend(srts)
+
+            if len(parts) == 2:
+                unit_id, title = known_units.get(os.path.normcase(os.path.abspath(directory)), (None, None))
+                unit = Unit(
+                    chapter.number, parts[1], directory, srts,
+                    [os.path.join(directory, name) for name in files if name.lower() == "readme.md"],
+                    [os.path.join(directory, name) for name in files if name.lower().endswith(IMAGE_EXTENSIONS)],
+                    unit_id, title,
+                )
+                chapter.units.append(unit)
+                if unit_id:
+                    self._units[unit_id] = unit
+
+    def chapters(self, numbers=None):
+        """The chapters with the given numbers (all when None), in number order."""
+        if numbers is None:
+            numbers = self._chapters
+        return [chapter for n in sorted(set(numbers)) for chapter in self._chapters.get(n, ())]
+
+    def units(self, chapters=None):
+        """The units of the given chapters, in folder order."""
+        return [unit for chapter in self.chapters(chapters) for unit in chapter.units]
+
+    def srt_files(self, chapters=None):
+        """Every .srt under the given chapters, e.g. srt_files(range(3, 7)) for chapters 3-6."""
+        return [path for chapter in self.chapters(chapters) for path in chapter.srts]
+
+    def unit(self, unit_id):
+        """The unit courses.json gives unit_id, or None."""
+        return self._units.get(unit_id)
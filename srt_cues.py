@@ -0,0 +1,205 @@
+"""
+Streaming SRT parser and writer shared by the subtitle tools.
+
+parse_cues() reads a file object, a byte stream, an iterable of lines or a
+whole string in one pass and yields Cue records as soon as each one is
+complete; write_cues() is its inverse.
+
+CueStore keeps a whole transcript (or batch of transcripts) in compact
+columns for tools that need every cue in memory at once.
+"""
+
+from array import array
+from bisect import bisect_left, bisect_right
+from typing import NamedTuple
+
+from srt_timecode import clamp_times, format_timecode, parse_timing_line, scale_times, shift_times
+
+
+class Cue(NamedTuple):
+    index: int
+    start_ms: int
+    end_ms: int
+    lines: tuple  # stripped, non-empty text lines
+
+
+def _iter_lines(source):
+    if isinstance(source, bytes):
+        source = source.decode('utf-8')
+    if isinstance(source, str):
+        source = source.splitlines()
+
+    first = True
+    for line in source:
+        if isinstance(line, bytes):
+            line = line.decode('utf-8')
+        if first:
+            line = line.lstrip('\ufeff')
+            first = False
+        yield line
+
+
+def _is_index(line):
+    return line.isdigit() and line.isascii()
+
+
+def parse_cues(source):
+    """
+    Yields a Cue for every 'index / start --> end / text' block in source.
+
+    A block starts at a number followed by a timing line, so a missing blank
+    line between cues is tolerated. Stray text after a cue's blank line is
+    kept with that cue; lines before the first cue are skipped.
+    """
+    lines = _iter_lines(source)
+    current = None
+    text = []
+
+    line = next(lines, None)
+    while line is not None:
+        stripped = line.strip()
+        following = next(lines, None)
+
+        if _is_index(stripped) and following is not None:
+            timing = parse_timing_line(following)
+            if timing is not None:
+                if current is not None:
+                    yield Cue(current[0], current[1], current[2], tuple(text))
+                current = (int(stripped), timing[0], timing[1])
+                text = []
+                line = next(lines, None)
+                continue
+
+        if stripped and current is not None:
+            text.append(stripped)
+        line = following
+
+    if current is not None:
+        yield Cue(current[0], current[1], current[2], tuple(text))
+
+
+def format_cue(cue):
+    head = f"{cue.index}\n{format_timecode(cue.start_ms)} --> {format_timecode(cue.end_ms)}\n"
+    return head + "".join(line + "\n" for line in cue.lines)
+
+
+def format_cues(cues):
+    """Returns cues as SRT text, separated by blank lines."""
+    return "\n".join(format_cue(cue) for cue in cues)
+
+
+def write_cues(cues, f):
+    """Writes cues to a text file object, separated by blank lines. Returns the cue count."""
+    count = 0
+    for cue in cues:
+        if count:
+            f.write("\n")
+        f.write(format_cue(cue))
+        count += 1
+    return count
+
+
+class CueStore:
+    """
+    Compact, read-only container for the cues of one or more transcripts.
+
+    Indexes and timestamps live in array('i') millisecond columns and all
+    text in one joined string addressed by offsets, so a stored cue costs a
+    few machine words plus its characters instead of a tuple, three ints and
+    a tuple of strings. Cues are materialized only when read.
+    """
+
+    __slots__ = ("indexes", "starts", "ends", "offsets", "text")
+
+    def __init__(self, cues=()):
+        self.indexes = array('i')
+        self.starts = array('i')
+        self.ends = array('i')
+        self.offsets = array('i', [0])
+
+        parts = []
+        position = 0
+        for cue in cues:
+            self.indexes.append(cue.index)
+            self.starts.append(cue.start_ms)
+            self.ends.append(cue.end_ms)
+            block = "\n".join(cue.lines)
+            parts.append(block)
+            position += len(block)
+            self.offsets.append(position)
+        self.text = "".join(parts)
+
+    @classmethod
+    def from_file(cls, path):
+        with open(path, 'r', encoding='utf-8') as f:
+            return cls(parse_cues(f))
+
+    @classmethod
+    def _from_columns(cls, indexes, starts, ends, offsets, text):
+        store = cls.__new__(cls)
+        store.indexes = indexes
+        store.starts = starts
+        store.ends = ends
+        store.offsets = offsets
+        store.text = text
+        return store
+
+    def __len__(self):
+        return len(self.indexes)
+
+    def _cue(self, i):
+        block = self.text[self.offsets[i]:self.offsets[i + 1]]
+        return Cue(self.indexes[i], self.starts[i], self.ends[i], tuple(block.split("\n")) if block else ())
+
+    def __iter__(self):
+        for i in range(len(self.indexes)):
+            yield self._cue(i)
+
+    def __getitem__(self, key):
+        if isinstance(key, slice):
+            start, stop, step = key.indices(len(self.indexes))
+            if step != 1:
+                return CueStore(self._cue(i) for i in range(start, stop, step))
+            if stop < start:
+                stop = start
+            base = self.offsets[start]
+            offsets = array('i', (offset - base for offset in self.offsets[start:stop + 1]))
+            return CueStore._from_columns(
+                self.indexes[start:stop], self.starts[start:stop], self.ends[start:stop],
+                offsets, self.text[base:self.offsets[stop]])
+
+        if key < 0:
+            key += len(self.indexes)
+        if not 0 <= key < len(self.indexes):
+            raise IndexError("cue index out of range")
+        return self._cue(key)
+
+    def line_count(self, i):
+        block = self.text[self.offsets[i]:self.offsets[i + 1]]
+        return block.count("\n") + 1 if block else 0
+
+    def between(self, start_ms, end_ms):
+        """Returns the cues overlapping [start_ms, end_ms). Cues must be in time order."""
+        lo = bisect_right(self.ends, start_ms)
+        hi = bisect_left(self.starts, end_ms)
+        return self[lo:max(lo, hi)]
+
+    def _retimed(self, starts, ends):
+        # Same cues and text, new time columns
+        return CueStore._from_columns(self.indexes, starts, ends, self.offsets, self.text)
+
+    def shift(self, offset_ms):
+        """Returns a store with every cue moved by offset_ms."""
+        return self._retimed(shift_times(self.starts, offset_ms), shift_times(self.ends, offset_ms))
+
+    def scale(self, factor, origin_ms=0):
+        """Returns a store with all times stretched by factor around origin_ms."""
+        return self._retimed(scale_times(self.starts, factor, origin_ms), scale_times(self.ends, factor, origin_ms))
+
+    def clamp(self, lo_ms=0, hi_ms=None):
+        """Returns a store with all times limited to [lo_ms, hi_ms]."""
+        return self._retimed(clamp_times(self.starts, lo_ms, hi_ms), clamp_times(self.ends, lo_ms, hi_ms))
+
+    @property
+    def duration_ms(self):
+        return max(self.ends) if self.ends else 0
@@ -0,0 +1,61 @@
+"""
+Term correction of whole subtitle files: each cue's joined text goes
+through a rule profile's replacer and is re-broken into short lines.
+
+rewrite_srt() is the file-level step shared by process_global_srt.py and
+process_srt_global_review.py; the rule profile, and so the chapter, is
+only a matter of which replacer it is given.
+"""
+
+from collections import Counter
+
+from srt_cues import CueStore, format_cues, parse_cues
+from srt_io import encode_text, write_if_changed
+from srt_manifest import file_digest
+from srt_recue import recue
+from srt_report import dry_run_stats
+from srt_stages import count, measure_file, stage, timed, timed_iter
+from srt_text import split_text
+
+
+def fix_cue(cue, replacer, balanced=False, hits=None):
+    """Corrects terms on the cue's joined text, then re-breaks it into short lines."""
+    full_text = replacer(" ".join(cue.lines), hits)
+    return cue._replace(lines=tuple(line for line in split_text(full_text, balanced=balanced) if line))
+
+
+def rewrite_srt(replacer, file_path, known_digest=None, balanced=False, split_cues=False, dry_run=False):
+    """
+    Fixes every cue of file_path and writes the file back if it changed.
+    Returns per-file stats; with dry_run, writes nothing and returns the
+    srt_report stats instead.
+    """
+    with measure_file(file_path):
+        with stage("read"), open(file_path, 'rb') as f:
+            original = f.read()
+        count(bytes_in=len(original))
+
+        # Touched but identical to what the last run wrote: nothing to do
+        if known_digest is not None and file_digest(original) == known_digest:
+            return {"file": file_path, "cues": None, "sha256": known_digest, "written": 0}
+
+        # A dry run also counts which rules fired
+        hits = Counter() if dry_run else None
+        # What fix_cue() spends outside the replacer is line splitting
+        replacer = timed("replace", replacer)
+        cues = timed_iter("parse", parse_cues(original))
+        cues = timed_iter("split", (fix_cue(cue, replacer, balanced, hits) for cue in cues))
+        if split_cues:
+            # Long cues become several timed cues instead of one tall block
+            cues = timed_iter("recue", recue(cues))
+        cues = CueStore(cues)
+        with stage("format"):
+            data = encode_text(format_cues(cues))
+        count(bytes_out=len(data), cues=len(cues))
+        if dry_run:
+            with stage("diff"):
+                return dry_run_stats(file_path, original, parse_cues(original), cues, data, hits)
+        with stage("write"):
+            written = write_if_changed(file_path, data, original)
+
+    return {"file": file_path, "cues": len(cues), "sha256": file_digest(data), "written": written}
@@ -0,0 +1,130 @@
+"""
+Persistent index of the .srt files in the course tree.
+
+The index records, for every directory under the root, its mtime, its
+subdirectories and the names of its .srt files. It is kept under
+.srt_cache, named by a hash of the tree's path, so saving it neither adds
+a file to the course tree nor touches the mtime of the root it indexes.
+Refreshing it stats each directory once and only lists the ones whose
+mtime changed, since adding, removing or renaming an entry is what
+updates a directory's mtime.
+
+Units are matched to subtitle files by the exact "<chapter>-<unit>" token
+in the file name, so unit-1-1 finds 1-1.srt or dify1-1.srt but never
+11-1.srt.
+"""
+
+import hashlib
+import json
+import os
+import re
+
+from srt_rules import CACHE_DIR
+
+INDEX_VERSION = 1
+
+_UNIT_TOKEN = re.compile(r"(?<!\d)(\d+-\d+)(?!\d)")
+
+
+def index_path(root):
+    """The index file of the tree at root."""
+    key = hashlib.sha256(os.path.normcase(os.path.abspath(root)).encode('utf-8')).hexdigest()[:16]
+    return os.path.join(CACHE_DIR, f"index-{key}.json")
+
+
+def unit_token(unit_id):
+    """'unit-1-1' -> '1-1', the part of a unit id that subtitle file names carry."""
+    return unit_id[len("unit-"):] if unit_id.startswith("unit-") else unit_id
+
+
+class SrtIndex:
+    def __init__(self, root):
+        self.root = os.path.abspath(root)
+        self.path = index_path(self.root)
+        self.dirs = self._load()
+        self.dirty = False
+        self.rescanned = 0
+        self.refresh()
+
+    def _load(self):
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            data = None
+        if not isinstance(data, dict) or data.get("version") != INDEX_VERSION:
+            return {}
+        return data.get("dirs", {})
+
+    def _key(self, directory):
+        return os.path.relpath(os.path.abspath(directory), self.root).replace(os.sep, '/')
+
+    def _scan(self, directory, mtime_ns):
+        subdirs = []
+        srts = []
+        with os.scandir(directory) as entries:
+            for entry in entries:
+                if entry.is_dir():
+                    subdirs.append(entry.name)
+                elif entry.name.lower().endswith(".srt") and entry.is_file():
+                    srts.append(entry.name)
+        self.rescanned += 1
+        return {"mtime_ns": mtime_ns, "subdirs": sorted(subdirs), "srts": sorted(srts)}
+
+    def refresh(self):
+        """Brings the index up to date, listing only directories whose mtime changed."""
+        seen = {}
+        pending = ["."]
+        while pending:
+            key = pending.pop()
+            directory = os.path.join(self.root, key)
+            try:
+                mtime_ns = os.stat(directory).st_mtime_ns
+            except OSError:
+                continue
+            entry = self.dirs.get(key)
+            if entry is None or entry.get("mtime_ns") != mtime_ns:
+                entry = self._scan(directory, mtime_ns)
+                self.dirty = True
+            seen[key] = entry
+            pending.extend(name if key == "." else f"{key}/{name}" for name in entry["subdirs"])
+        if seen.keys() != self.dirs.keys():
+            self.dirty = True
+        self.dirs = seen
+
+    def srt_files(self, directory):
+        """Paths of the .srt files directly in directory. Directories outside the tree are listed on the spot."""
+        key = self._key(directory)
+        entry = self.dirs.get(key)
+        if entry is not None:
+            base = os.path.join(self.root, key)
+        elif os.path.isdir(directory):
+            entry = self._scan(directory, None)
+            base = directory
+        else:
+            return []
+        return [os.path.normpath(os.path.join(base, name)) for name in entry["srts"]]
+
+    def find_unit_srt(self, unit_id, directory):
+        """
+        The .srt for unit_id in directory: the file whose name carries the
+        unit's exact id, or the only .srt there. None when neither applies.
+        """
+        token = unit_token(unit_id)
+        paths = self.srt_files(directory)
+        for path in paths:
+            if token in _UNIT_TOKEN.findall(os.path.basename(path)):
+                return path
+        if len(paths) == 1:
+            return paths[0]
+        return None
+
+    def save(self):
+        if not self.dirty:
+            return
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        tmp_path = f"{self.path}.{os.getpid()}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({"version": INDEX_VERSION, "dirs": self.dirs}, f, ensure_ascii=False, sort_keys=True)
+        os.replace(tmp_path, self.path)
+        self.dirty = False
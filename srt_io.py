@@ -0,0 +1,120 @@
+"""
+Output helpers for the in-place SRT rewriters.
+
+Files are only written when their bytes actually change, and then through a
+temporary file in the same directory that is renamed over the original, so
+clean files keep their mtime and a crash never leaves a truncated file.
+AtomicWriter does the same for output that is written as it is produced.
+"""
+
+import os
+import shutil
+import tempfile
+
+# Read once at import: os.umask() can only be read by setting it, which is
+# not safe once threads run
+_UMASK = os.umask(0)
+os.umask(_UMASK)
+
+
+def encode_text(text):
+    """The bytes open(path, 'w', encoding='utf-8') would write for text on this platform."""
+    if os.linesep != "\n":
+        text = text.replace("\n", os.linesep)
+    return text.encode('utf-8')
+
+
+def _set_mode(path, tmp_path):
+    # mkstemp() creates files owner-only; give the output the mode of the
+    # file it replaces, or what open() would have given a new file
+    if os.path.exists(path):
+        shutil.copymode(path, tmp_path)
+    else:
+        os.chmod(tmp_path, 0o666 & ~_UMASK)
+
+
+def atomic_write(path, data):
+    """Replaces path with data (bytes) in one rename. Keeps the file's permissions, or follows the umask for a new file."""
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, tmp_path = tempfile.mkstemp(prefix=".", suffix=".tmp", dir=directory)
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        _set_mode(path, tmp_path)
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+        raise
+
+
+class AtomicWriter:
+    """
+    Text file that replaces path when the with block exits cleanly, written
+    through a temporary file in the same directory like atomic_write(). On
+    an exception, or after discard(), path is left as it was.
+    """
+
+    def __init__(self, path, encoding='utf-8'):
+        self.path = path
+        directory = os.path.dirname(os.path.abspath(path))
+        fd, self.tmp_path = tempfile.mkstemp(prefix=".", suffix=".tmp", dir=directory)
+        self.file = os.fdopen(fd, 'w', encoding=encoding)
+        self.discarded = False
+
+    def write(self, text):
+        return self.file.write(text)
+
+    def discard(self):
+        self.discarded = True
+
+    def __enter__(self):
+        return self
+
+    def _remove_tmp(self):
+        self.file.close()
+        try:
+            os.remove(self.tmp_path)
+        except OSError:
+            pass
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is not None or self.discarded:
+            self._remove_tmp()
+            return
+        try:
+            self.file.flush()
+            os.fsync(self.file.fileno())
+            self.file.close()
+            _set_mode(self.path, self.tmp_path)
+            os.replace(self.tmp_path, self.path)
+        except BaseException:
+            self._remove_tmp()
+            raise
+
+
+def write_if_changed(path, data, original=None):
+    """
+    Writes data (bytes) to path unless the file already holds exactly those
+    bytes. Returns the number of bytes written, 0 when nothing changed.
+    """
+    if original is None:
+        try:
+            with open(path, 'rb') as f:
+                original = f.read()
+        except OSError:
+            original = None
+    if data == original:
+        return 0
+
+    atomic_write(path, data)
+    return len(data)
+
+
+def write_text_if_changed(path, text, original=None):
+    """write_if_changed() for text, encoded as the text-mode writers would."""
+    return write_if_changed(path, encode_text(text), original)
@@ -0,0 +1,111 @@
+"""
+Content-hash manifest for incremental runs over the course tree.
+
+For every file a tool has processed, the manifest stores its size, mtime,
+SHA-256 and the digest of the rule table used. On the next run a file whose
+stat and rule digest still match is skipped without being opened; a file
+that was only touched is skipped after one hash. The manifests of a tree,
+one section per tool, are kept in one file under .srt_cache, named by a
+hash of the tree's path, so nothing is written into the course tree.
+"""
+
+import hashlib
+import json
+import os
+
+from srt_rules import CACHE_DIR
+
+MANIFEST_VERSION = 1
+
+
+def file_digest(data):
+    return hashlib.sha256(data).hexdigest()
+
+
+def read_digest(path, block_size=1 << 20):
+    """(file_digest() of the file at path, its size), reading it a block at a time."""
+    digest = hashlib.sha256()
+    size = 0
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(block_size), b""):
+            digest.update(block)
+            size += len(block)
+    return digest.hexdigest(), size
+
+
+def manifest_path(root):
+    """The manifest file of the tree at root."""
+    key = hashlib.sha256(os.path.normcase(os.path.abspath(root)).encode('utf-8')).hexdigest()[:16]
+    return os.path.join(CACHE_DIR, f"manifest-{key}.json")
+
+
+class Manifest:
+    def __init__(self, root, tool):
+        self.root = root
+        self.tool = tool
+        self.path = manifest_path(root)
+        self.data = self._load()
+        self.entries = self.data.setdefault(tool, {})
+        self.dirty = False
+
+    def _load(self):
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            data = None
+        if not isinstance(data, dict) or data.get("version") != MANIFEST_VERSION:
+            data = {"version": MANIFEST_VERSION}
+        return data
+
+    def key(self, path):
+        return os.path.relpath(path, self.root).replace(os.sep, '/')
+
+    def get(self, path):
+        return self.entries.get(self.key(path))
+
+    def is_current(self, path, rules):
+        """True if path is unchanged since it was processed with these rules. Only stats the file."""
+        entry = self.get(path)
+        if not entry or entry.get("rules") != rules:
+            return False
+        try:
+            st = os.stat(path)
+        except OSError:
+            return False
+        return st.st_size == entry.get("size") and st.st_mtime_ns == entry.get("mtime_ns")
+
+    def known_digest(self, path, rules):
+        """The content hash recorded for path under these rules, if any."""
+        entry = self.get(path)
+        if entry and entry.get("rules") == rules:
+            return entry.get("sha256")
+        return None
+
+    def record(self, path, rules, sha256, **extra):
+        st = os.stat(path)
+        entry = {
+            "size": st.st_size,
+            "mtime_ns": st.st_mtime_ns,
+            "sha256": sha256,
+            "rules": rules,
+        }
+        entry.update(extra)
+        self.entries[self.key(path)] = entry
+        self.dirty = True
+
+    def save(self):
+        # Forget files that were deleted or renamed since they were recorded
+        for key in list(self.entries):
+            if not os.path.exists(os.path.join(self.root, key)):
+                del self.entries[key]
+                self.dirty = True
+        if not self.dirty:
+            return
+
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        tmp_path = f"{self.path}.{os.getpid()}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(self.data, f, ensure_ascii=False, sort_keys=True)
+        os.replace(tmp_path, self.path)
+        self.dirty = False
@@ -0,0 +1,93 @@
+"""
+Memory-mapped SRT reader for transcripts too large to load as text.
+
+MappedTranscript maps the file and finds cue boundaries on the raw UTF-8
+bytes, so no str copy of the file is ever made. Each cue comes back as a
+CueSpan of its timing and the byte range of its text; the text is only
+decoded when lines() or cues() asks for it. Checks that only need
+timings or line counts run over any file size with flat memory.
+
+Cues are found the same way as srt_cues.parse_cues(): a number followed
+by a valid timing line starts a cue, and everything up to the next one is
+its text.
+"""
+
+import mmap
+import re
+from typing import NamedTuple
+
+from srt_cues import Cue
+from srt_timecode import parse_timing_line
+
+# An index line and the timing line under it
+_CUE_HEADER = re.compile(rb"^(?:\xef\xbb\xbf)?[ \t]*(\d+)[ \t]*\r?\n([^\r\n]*-->[^\r\n]*)\r?$", re.MULTILINE)
+
+
+class CueSpan(NamedTuple):
+    index: int
+    start_ms: int
+    end_ms: int
+    text_start: int  # byte range of the cue's text in the file
+    text_end: int
+
+
+class MappedTranscript:
+    """
+    Read-only view of an SRT file through mmap. Use it as a context manager;
+    the file stays mapped, and cannot be replaced on Windows, until closed.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._file = open(path, 'rb')
+        try:
+            self.data = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            # An empty file cannot be mapped
+            self.data = b""
+
+    def close(self):
+        if isinstance(self.data, mmap.mmap):
+            self.data.close()
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def spans(self):
+        """Yields a CueSpan for every cue, in file order, without decoding any text."""
+        current = None
+        for match in _CUE_HEADER.finditer(self.data):
+            timing = parse_timing_line(match.group(2).decode('ascii', errors='replace'))
+            if timing is None:
+                continue
+            if current is not None:
+                yield CueSpan(current[0], current[1], current[2], current[3], match.start())
+            current = (int(match.group(1)), timing[0], timing[1], match.end())
+        if current is not None:
+            yield CueSpan(current[0], current[1], current[2], current[3], len(self.data))
+
+    def line_count(self, span):
+        """
+        Non-blank text lines of a cue, counted on the bytes. A line holding
+        only non-ASCII whitespace counts too, so this can exceed
+        len(lines(span)) but never falls short of it.
+        """
+        return sum(1 for line in self.data[span.text_start:span.text_end].split(b"\n") if line.strip())
+
+    def lines(self, span):
+        """The cue's stripped, non-empty text lines, decoded."""
+        text = self.data[span.text_start:span.text_end].decode('utf-8')
+        return tuple(line for line in map(str.strip, text.splitlines()) if line)
+
+    def cues(self):
+        """Yields the file's cues as srt_cues.Cue records, decoding one cue at a time."""
+        for span in self.spans():
+            yield Cue(span.index, span.start_ms, span.end_ms, self.lines(span))
+
+    def duration_ms(self):
+        """Latest end time of any cue, 0 for a file without cues."""
+        return max((span.end_ms for span in self.spans()), default=0)
@@ -0,0 +1,53 @@
+"""
+Process-pool runner for the whole-tree subtitle scripts.
+
+Work is split per file. Data every file needs, such as the compiled rule
+tables, is passed as `shared` and sent to each worker once when the pool
+starts instead of with every task. Results come back in task order, so
+reports merge exactly as in a serial run. Stage timings a worker records
+(srt_stages) come back with each result.
+"""
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+from srt_stages import add_records, take_records
+
+_shared = None
+
+
+def _init_worker(shared):
+    global _shared
+    _shared = shared
+
+
+def _run_task(task):
+    func, args = task
+    return func(_shared, *args), take_records()
+
+
+def resolve_jobs(jobs):
+    """--jobs 0 means one worker per CPU."""
+    if not jobs or jobs < 0:
+        return os.cpu_count() or 1
+    return jobs
+
+
+def map_files(func, tasks, shared=None, jobs=1):
+    """
+    Yields func(shared, *task) for every task tuple, in order.
+    func must be a module-level function so it can be sent to workers.
+    """
+    tasks = list(tasks)
+    jobs = min(resolve_jobs(jobs), len(tasks))
+    if jobs <= 1:
+        for args in tasks:
+            yield func(shared, *args)
+        return
+
+    # Small chunks keep the pool busy when file sizes are uneven
+    chunksize = max(1, len(tasks) // (jobs * 8))
+    with ProcessPoolExecutor(max_workers=jobs, initializer=_init_worker, initargs=(shared,)) as pool:
+        for result, records in pool.map(_run_task, [(func, args) for args in tasks], chunksize=chunksize):
+            add_records(records)
+            yield result
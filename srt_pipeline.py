@@ -0,0 +1,301 @@
+"""
+Single-pass subtitle cleanup: the steps of the separate tools as stages
+over one cue stream.
+
+A full cleanup used to run check_and_fix_srt_global.py, process_global_srt.py
+and merge_multiline_subs.py in turn, each reading, parsing and rewriting
+every file. run_file() streams a file once through the stages, in the
+order given, into a temporary file that replaces it only if it changed.
+
+A Stage wraps a generator function func(cues, job) that takes the cue
+stream and yields the new one; job carries what the stages of one file
+share. Stages compose with |, and nothing runs until the result is
+iterated, one cue at a time:
+
+    (parse | sc2tc | fix_terms | merge | resplit | write)(src, job)
+
+parse turns a file object, bytes or text into cues and write streams them
+to job.out as they arrive, so reading, fixing and writing interleave and
+memory does not grow with the transcript. The registered stages, by the
+names --stages takes:
+
+  sc2tc  simplified to traditional Chinese, line by line, as check_and_fix_srt_global.py
+  terms  the rule profile's corrections on each cue's joined text, as process_global_srt.py
+  merge  multi-line cues joined into one line, as merge_multiline_subs.py
+  split  each cue's text re-broken into short lines, as process_global_srt.py
+  recue  cues longer than two lines split into separately timed cues
+  check  records the cues that have more than one line; changes nothing
+
+The default, "sc2tc,check,terms,split", does in one pass what
+check_and_fix_srt_global.py followed by process_global_srt.py does in two,
+given the same files and rule profile (process_pipeline.py defaults to
+process_global_srt.py's chapters-1-3).
+check comes before split, as in check_and_fix_srt_global.py, so it reports
+the multi-line cues of the input rather than the lines split just made.
+
+New fixes are generator functions decorated with @register(name), or
+per-cue checks decorated with @validator(name), in any module that is
+imported before the pipeline is built (process_pipeline.py --plugin).
+A validator only records issues; with job.fail_fast the stream ends at
+the first one, so a validating run stops reading the file there.
+"""
+
+import hashlib
+from importlib import import_module
+
+from srt_cues import format_cue, parse_cues
+from srt_io import AtomicWriter, encode_text
+from srt_manifest import read_digest
+from srt_recue import recue
+from srt_stages import count, measure_file, stage, timed_iter
+from srt_text import join_lines, split_text
+
+DEFAULT_STAGES = ("sc2tc", "check", "terms", "split")
+
+STAGES = {}  # name -> Stage, for --stages
+
+
+class FileJob:
+    """What the stages of one file share: its matchers, options, output and what they found."""
+
+    def __init__(self, path, converter=None, replacer=None, balanced=False, fail_fast=False, out=None):
+        self.path = path
+        self.converter = converter
+        self.replacer = replacer
+        self.balanced = balanced
+        self.fail_fast = fail_fast  # end the stream at the first issue a validator finds
+        self.out = out              # text file the write stage streams to
+        self.issues = []            # what the validators found, in cue order
+        self.merged = 0             # cues the merge stage joined
+
+
+def _stage(module, name):
+    # Unpickles a stage in a worker process: importing its module registers it
+    module = import_module(module)
+    return STAGES.get(name) or getattr(module, name)
+
+
+class Stage:
+    def __init__(self, name, func):
+        self.name = name
+        self.func = func
+
+    def __call__(self, cues, job):
+        return timed_iter(self.name, self.func(cues, job))
+
+    def __or__(self, other):
+        return Pipeline((self,)) | other
+
+    def __reduce__(self):
+        # By name, so stages built by decorators can be sent to workers
+        return _stage, (self.func.__module__, self.name)
+
+    def __repr__(self):
+        return f"Stage({self.name!r})"
+
+
+class Pipeline:
+    def __init__(self, stages=()):
+        self.stages = tuple(stages)
+
+    def __call__(self, cues, job):
+        """Chains the stages over cues; nothing runs until the result is iterated."""
+        for stage_ in self.stages:
+            cues = stage_(cues, job)
+        return cues
+
+    def __or__(self, other):
+        return Pipeline(self.stages + (other.stages if isinstance(other, Pipeline) else (other,)))
+
+    @property
+    def names(self):
+        return tuple(stage_.name for stage_ in self.stages)
+
+    def __repr__(self):
+        return " | ".join(self.names) or "Pipeline()"
+
+
+def register(name):
+    """Decorator: the generator function becomes the Stage STAGES[name]."""
+    def decorate(func):
+        STAGES[name] = Stage(name, func)
+        return STAGES[name]
+    return decorate
+
+
+def validator(name):
+    """
+    Decorator for a check(cue, job) that returns an issue or None: the
+    registered stage passes the cues on unchanged and adds the issues to
+    job.issues, ending the stream at the first one if job.fail_fast.
+    """
+    def decorate(check):
+        def validate(cues, job):
+            for cue in cues:
+                issue = check(cue, job)
+                if issue is not None:
+                    job.issues.append(issue)
+                    if job.fail_fast:
+                        return
+                yield cue
+        validate.__module__ = check.__module__
+        return register(name)(validate)
+    return decorate
+
+
+def drain(cues):
+    """Runs a pipeline to the end for its side effects. Returns the number of cues that came out."""
+    total = 0
+    for _ in cues:
+        total += 1
+    return total
+
+
+def _parse(source, job):
+    return parse_cues(source)
+
+
+def _write(cues, job):
+    # Each cue goes out as soon as it is fixed, then on to any later stage
+    out = job.out
+    first = True
+    for cue in cues:
+        if not first:
+            out.write("\n")
+        out.write(format_cue(cue))
+        first = False
+        yield cue
+
+
+parse = Stage("parse", _parse)
+write = Stage("write", _write)
+
+
+@register("sc2tc")
+def sc2tc(cues, job):
+    converter = job.converter
+    for cue in cues:
+        yield cue._replace(lines=tuple(converter(line) for line in cue.lines))
+
+
+@register("terms")
+def fix_terms(cues, job):
+    # Corrections can span a line break, so they run on the joined text
+    replacer = job.replacer
+    for cue in cues:
+        text = replacer(" ".join(cue.lines))
+        yield cue._replace(lines=(text,) if text else ())
+
+
+@register("merge")
+def merge(cues, job):
+    for cue in cues:
+        if len(cue.lines) > 1:
+            job.merged += 1
+            cue = cue._replace(lines=(join_lines(cue.lines),))
+        yield cue
+
+
+@register("split")
+def resplit(cues, job):
+    for cue in cues:
+        lines = split_text(" ".join(cue.lines), balanced=job.balanced)
+        yield cue._replace(lines=tuple(line for line in lines if line))
+
+
+@register("recue")
+def recue_cues(cues, job):
+    return recue(cues)
+
+
+@validator("check")
+def check_lines(cue, job):
+    if len(cue.lines) > 1:
+        return {"id": str(cue.index), "text": list(cue.lines)}
+    return None
+
+
+def parse_stages(text):
+    """'sc2tc,terms,split' -> the Pipeline of those stages. Raises ValueError for an unknown stage."""
+    names = [name.strip() for name in text.split(",") if name.strip()]
+    unknown = [name for name in names if name not in STAGES]
+    if unknown:
+        raise ValueError(f"unknown stage {', '.join(unknown)}; choose from {', '.join(STAGES)}")
+    return Pipeline(STAGES[name] for name in names)
+
+
+class _DigestWriter:
+    # The write stage's output, hashed as it goes: the bytes the file will
+    # hold, without keeping them
+    def __init__(self, out):
+        self.out = out
+        self.sha256 = hashlib.sha256()
+        self.size = 0
+
+    def write(self, text):
+        data = encode_text(text)
+        self.sha256.update(data)
+        self.size += len(data)
+        return self.out.write(text)
+
+
+def run_file(pipeline, file_path, converter=None, replacer=None, known_digest=None, balanced=False):
+    """
+    Streams file_path through pipeline into a temporary file, one cue at a
+    time, and replaces file_path with it if the bytes changed.
+    """
+    with measure_file(file_path):
+        with stage("read"):
+            original_digest, size = read_digest(file_path)
+        count(bytes_in=size)
+
+        # Touched but identical to what the last run wrote: keep the recorded issues
+        if known_digest is not None and original_digest == known_digest:
+            return {"file": file_path, "cues": None, "issues": None, "sha256": known_digest, "written": 0}
+
+        # The source is closed before the output replaces it
+        with AtomicWriter(file_path) as writer:
+            out = _DigestWriter(writer)
+            job = FileJob(file_path, converter, replacer, balanced, out=out)
+            with open(file_path, 'r', encoding='utf-8') as src:
+                cues = drain((parse | pipeline | write)(src, job))
+            digest = out.sha256.hexdigest()
+            if digest == original_digest:
+                writer.discard()
+        written = 0 if writer.discarded else out.size
+        count(bytes_out=out.size, cues=cues)
+
+    return {
+        "file": file_path,
+        "cues": cues,
+        "issues": job.issues,
+        "sha256": digest,
+        "written": written,
+    }
+
+
+def validate_file(pipeline, file_path, converter=None, replacer=None, balanced=False):
+    """
+    Runs file_path through pipeline without writing anything, and stops
+    reading it at the first issue a validator finds.
+    """
+    with measure_file(file_path):
+        job = FileJob(file_path, converter, replacer, balanced, fail_fast=True)
+        with open(file_path, 'r', encoding='utf-8') as src:
+            cues = drain((parse | pipeline)(src, job))
+        count(cues=cues)
+    return {"file": file_path, "cues": cues, "issues": job.issues}
+
+
+def rules_digest(pipeline, table, balanced=False):
+    """What a file's output depends on, for the manifest: the stages, in order, and the rules they use."""
+    names = pipeline.names
+    parts = ["+".join(names)]
+    if "sc2tc" in names:
+        from check_and_fix_srt_global import sc_to_tc_table
+        parts.append(sc_to_tc_table().digest)
+    if "terms" in names:
+        parts.append(table.digest)
+    if balanced and "split" in names:
+        parts.append("balanced")
+    return ":".join(parts)
@@ -0,0 +1,88 @@
+"""
+Re-cueing: splits cues that hold more lines than a player should show at
+once into consecutive cues of their own.
+
+The cue's time span is shared out in proportion to how many characters
+each new cue shows, with a minimum display duration, and every cue that
+comes out is renumbered. recue() is a generator over cues, so it runs in
+one streaming pass alongside parse_cues() and write_cues() and never holds
+more than one cue of a transcript.
+"""
+
+from srt_cues import parse_cues, write_cues
+from srt_io import AtomicWriter
+
+MAX_LINES = 2
+MIN_DURATION_MS = 800
+
+
+def _weight(lines):
+    return max(1, sum(len(line) - line.count(" ") for line in lines))
+
+
+def _group_lines(lines, count):
+    # count groups of consecutive lines, sizes differing by at most one
+    size, extra = divmod(len(lines), count)
+    groups = []
+    start = 0
+    for i in range(count):
+        end = start + size + (i < extra)
+        groups.append(lines[start:end])
+        start = end
+    return groups
+
+
+def _boundaries(start_ms, end_ms, weights, min_duration_ms):
+    # Proportional cut points, then pushed apart so every piece lasts at
+    # least min_duration_ms; the caller makes sure that is possible
+    total = sum(weights)
+    span = end_ms - start_ms
+    cuts = [start_ms]
+    running = 0
+    for weight in weights[:-1]:
+        running += weight
+        cuts.append(start_ms + round(span * running / total))
+    cuts.append(end_ms)
+
+    for i in range(1, len(cuts) - 1):
+        cuts[i] = max(cuts[i], cuts[i - 1] + min_duration_ms)
+    for i in range(len(cuts) - 2, 0, -1):
+        cuts[i] = min(cuts[i], cuts[i + 1] - min_duration_ms)
+    return cuts
+
+
+def split_cue(cue, max_lines=MAX_LINES, min_duration_ms=MIN_DURATION_MS):
+    """
+    Returns cue as a list of cues of at most max_lines lines each, keeping
+    its index. A cue too short to give every piece min_duration_ms is split
+    into fewer, fuller pieces instead.
+    """
+    lines = cue.lines
+    count = -(-len(lines) // max_lines)
+    if min_duration_ms > 0:
+        count = min(count, (cue.end_ms - cue.start_ms) // min_duration_ms)
+    if count <= 1:
+        return [cue]
+
+    groups = _group_lines(lines, count)
+    cuts = _boundaries(cue.start_ms, cue.end_ms, [_weight(group) for group in groups], min_duration_ms)
+    return [cue._replace(start_ms=cuts[i], end_ms=cuts[i + 1], lines=group) for i, group in enumerate(groups)]
+
+
+def recue(cues, max_lines=MAX_LINES, min_duration_ms=MIN_DURATION_MS, first_index=1):
+    """Yields cues split to at most max_lines lines each, numbered from first_index."""
+    index = first_index
+    for cue in cues:
+        for piece in split_cue(cue, max_lines, min_duration_ms):
+            yield piece._replace(index=index)
+            index += 1
+
+
+def recue_file(src_path, dst_path, max_lines=MAX_LINES, min_duration_ms=MIN_DURATION_MS):
+    """
+    Re-cues src_path into dst_path one cue at a time. Returns the number of
+    cues written. dst_path is replaced only once the whole file is written,
+    so it may be src_path itself.
+    """
+    with open(src_path, 'r', encoding='utf-8') as src, AtomicWriter(dst_path) as dst:
+        return write_cues(recue(parse_cues(src), max_lines, min_duration_ms), dst)
@@ -0,0 +1,235 @@
+"""
+Single-pass replacement engine for the subtitle term-correction lists.
+
+All rules are compiled into one alternation regex with the longest keys first,
+so a transcript is scanned once no matter how many rules there are, and text
+produced by one rule is never re-matched by another.
+
+A rule is (old, new) or (old, new, options). Options narrow where old may
+match and become lookarounds inside the same regex, so they cost no extra
+pass:
+
+    word         old must not touch an ASCII letter, digit or underscore on
+                 either side; CJK neighbours are fine, so ("ON", "ARM") fixes
+                 "ON的版本" but leaves "JSON" and "MONDAY" alone
+    ignore_case  old matches in any case
+    before       regex the text just before old must match (fixed width)
+    not_before   regex the text just before old must not match (fixed width)
+    after        regex the text just after old must match
+    not_after    regex the text just after old must not match
+"""
+
+import re
+from functools import lru_cache
+
+OPTIONS = ("word", "ignore_case", "before", "not_before", "after", "not_after")
+
+_ASCII_WORD = "[A-Za-z0-9_]"
+
+
+def freeze_rule(rule):
+    """(old, new) or (old, new, options) with options as a sorted tuple, so rules can be hashed."""
+    old, new, *options = rule
+    if not options or not options[0]:
+        return (old, new)
+    options = options[0]
+    items = options.items() if isinstance(options, dict) else options
+    return (old, new, tuple(sorted(items)))
+
+
+def _rule_patterns(old, options):
+    """
+    The regex branches for one scoped rule. Every branch starts with a
+    literal character: a branch opening with a lookaround, a class or a
+    group keeps re from skipping ahead to the characters any rule can start
+    with, which makes the whole table several times slower. So conditions
+    on the text before old are checked once old has matched, as lookbehinds
+    that span old too, and ignore_case gets one branch per case of the
+    first character.
+    """
+    unknown = set(options) - set(OPTIONS)
+    if unknown:
+        raise ValueError(f"unknown rule options for {old!r}: {', '.join(sorted(unknown))}")
+
+    rest = re.escape(old[1:])
+    if options.get("ignore_case"):
+        heads = dict.fromkeys((old[0].lower(), old[0].upper()))
+        if rest:
+            rest = f"(?i:{rest})"
+    else:
+        heads = (old[0],)
+    body = "(?i:" + re.escape(old) + ")" if options.get("ignore_case") else re.escape(old)
+
+    tail = ""
+    if options.get("word"):
+        if re.fullmatch(_ASCII_WORD, old[0]):
+            tail += f"(?<!{_ASCII_WORD}{body})"
+        if re.fullmatch(_ASCII_WORD, old[-1]):
+            tail += f"(?!{_ASCII_WORD})"
+    if options.get("before"):
+        tail += f"(?<=(?:{options['before']}){body})"
+    if options.get("not_before"):
+        tail += f"(?<!(?:{options['not_before']}){body})"
+    if options.get("after"):
+        tail += f"(?={options['after']})"
+    if options.get("not_after"):
+        tail += f"(?!{options['not_after']})"
+    return [re.escape(head) + rest + tail for head in heads]
+
+
+class Replacer:
+    """Applies a list of rules in one leftmost-longest pass."""
+
+    def __init__(self, pairs):
+        table = {}
+        scoped = {}
+        for rule in pairs:
+            rule = freeze_rule(rule)
+            old, new = rule[0], rule[1]
+            # Same precedence as the old sequential loop: the first rule wins
+            if not old:
+                continue
+            if len(rule) == 3:
+                scoped.setdefault((old, rule[2]), new)
+            elif old not in table:
+                table[old] = new
+        self.table = table
+
+        # Longest first; at equal length a scoped rule is tried before a plain one
+        branches = []
+        self.scoped = {}
+        for (old, options), new in scoped.items():
+            patterns = _rule_patterns(old, dict(options))
+            branches.extend((-len(old), 0, pattern) for pattern in patterns)
+            # Which scoped rule matched is worked out again from the match,
+            # since groups to tell them apart would cost the fast scan too
+            check = re.compile("|".join(patterns))
+            self.scoped.setdefault(old.lower(), []).append((check, old, new))
+        branches.extend((-len(old), 1, re.escape(old)) for old in table)
+        branches.sort(key=lambda branch: branch[:2])
+
+        if branches:
+            self.pattern = re.compile("|".join(pattern for _, _, pattern in branches))
+        else:
+            self.pattern = None
+
+    def __len__(self):
+        return len(self.table) + sum(map(len, self.scoped.values()))
+
+    def _resolve(self, match):
+        # (old, new) of the rule that produced match
+        text = match.group()
+        if self.scoped:
+            # Tried in the same order as their branches
+            for check, old, new in self.scoped.get(text.lower(), ()):
+                if check.match(match.string, match.start()):
+                    return old, new
+        return text, self.table[text]
+
+    def _substitute(self, match):
+        return self._resolve(match)[1]
+
+    def apply(self, text, hits=None):
+        """
+        Returns text with every rule applied. When hits is given (a
+        collections.Counter), each match also adds one to hits[old] of the
+        rule that made it; identity rules that only shield a word count too.
+        """
+        if self.pattern is None:
+            return text
+        if hits is None:
+            return self.pattern.sub(self._substitute, text)
+
+        def substitute(match):
+            old, new = self._resolve(match)
+            hits[old] += 1
+            return new
+
+        return self.pattern.sub(substitute, text)
+
+    __call__ = apply
+
+
+@lru_cache(maxsize=None)
+def _compile(pairs):
+    return Replacer(pairs)
+
+
+def compile_replacements(pairs):
+    """
+    Returns a Replacer for the given rules.
+    Identical tables share one compiled matcher for the whole run.
+    """
+    return _compile(tuple(freeze_rule(rule) for rule in pairs))
+
+
+def _apply_in_order(text, pairs):
+    for old, new in pairs:
+        text = text.replace(old, new)
+    return text
+
+
+class Converter:
+    """
+    Converter for character-level mappings such as SC->TC.
+
+    Multi-character keys are applied in one Replacer pass, then all
+    single-character keys in one str.translate pass. translate() is slow on
+    non-ASCII text it leaves unchanged, so a character-class scan hands it
+    only the runs of mapped characters.
+
+    Each key's output is resolved against the entries after it, and keys that
+    an earlier entry always rewrites first are dropped. The result matches
+    applying the mapping one entry after another, in order, as long as no
+    two multi-character keys overlap in the text once earlier entries have
+    rewritten it. With overlapping phrases the single pass picks the longest
+    match where sequential replaces would pick the earlier entry. The
+    shipped SC->TC tables meet this condition.
+    """
+
+    def __init__(self, pairs):
+        rules = []
+        seen = set()
+        for old, new in pairs:
+            if old and old != new and old not in seen:
+                seen.add(old)
+                rules.append((old, new))
+
+        phrases = []
+        chars = {}
+        for i, (old, new) in enumerate(rules):
+            if len(old) > 1 and _apply_in_order(old, rules[:i]) != old:
+                continue
+            new = _apply_in_order(new, rules[i + 1:])
+            if len(old) == 1:
+                chars[old] = new
+            else:
+                phrases.append((old, new))
+
+        self.phrases = Replacer(phrases)
+        self.chars = str.maketrans(chars)
+        if chars:
+            self.char_runs = re.compile("[" + "".join(re.escape(c) for c in chars) + "]+")
+        else:
+            self.char_runs = None
+
+    def _translate_run(self, match):
+        return match.group().translate(self.chars)
+
+    def apply(self, text):
+        text = self.phrases.apply(text)
+        if self.char_runs is None:
+            return text
+        return self.char_runs.sub(self._translate_run, text)
+
+    __call__ = apply
+
+
+@lru_cache(maxsize=None)
+def _compile_converter(pairs):
+    return Converter(pairs)
+
+
+def compile_converter(pairs):
+    """Returns a Converter for the given pairs, shared by identical tables."""
+    return _compile_converter(tuple((old, new) for old, new in pairs))
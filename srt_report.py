@@ -0,0 +1,92 @@
+"""
+Dry-run reports for the rule-based rewriters.
+
+A dry run goes through a rewriter's whole pipeline but writes nothing.
+Each file comes back with the rule hits the matcher counted while it
+worked (Replacer.apply(text, hits)), how many of its cues would change and
+a unified diff. DryRunReport merges those over the tree and lists the
+rules that never matched, which only cost scan time.
+
+The summary comes before the diffs, so a saved report can still be
+applied with patch -p0.
+"""
+
+import difflib
+from collections import Counter
+
+
+def changed_cues(before, after):
+    """Number of cues in before that do not come out unchanged, timing and text alike."""
+    remaining = Counter((cue.start_ms, cue.end_ms, cue.lines) for cue in after)
+    changed = 0
+    for cue in before:
+        key = (cue.start_ms, cue.end_ms, cue.lines)
+        if remaining[key]:
+            remaining[key] -= 1
+        else:
+            changed += 1
+    return changed
+
+
+def unified_diff(path, before, after):
+    """Unified diff between two versions of a file's text, '' when they are equal."""
+    if before == after:
+        return ""
+    # The tab ends the file name for patch, which would otherwise stop at a space
+    lines = difflib.unified_diff(before.splitlines(), after.splitlines(), f"{path}\t", f"{path}\t", lineterm="")
+    return "\n".join(lines) + "\n"
+
+
+def dry_run_stats(file_path, original, before, after, data, hits):
+    """
+    The per-file result of a dry run: original and data are the file's
+    bytes before and after, before and after its cues.
+    """
+    return {
+        "file": file_path,
+        "cues": len(after),
+        "written": 0,
+        "hits": hits,
+        "changed_cues": changed_cues(before, after),
+        "diff": unified_diff(file_path, original.decode('utf-8'), data.decode('utf-8')),
+    }
+
+
+class DryRunReport:
+    def __init__(self, rules=()):
+        # Every rule key the run could have matched, in table order
+        self.rules = list(dict.fromkeys(rule[0] for rule in rules))
+        self.hits = Counter()
+        self.files = []  # (path, changed cues, diff) of files that would change
+        self.checked = 0
+
+    def add(self, stats):
+        self.checked += 1
+        self.hits.update(stats["hits"])
+        if stats["diff"]:
+            self.files.append((stats["file"], stats["changed_cues"], stats["diff"]))
+
+    def unused_rules(self):
+        return [old for old in self.rules if not self.hits[old]]
+
+    def format(self):
+        out = [f"Dry run: {len(self.files)} of {self.checked} files would change, "
+               f"{sum(changed for _, changed, _ in self.files)} cues in all.\n"]
+
+        out.append("\nChanged cues per file:\n")
+        for path, changed, _ in self.files:
+            out.append(f"  {changed:>6}  {path}\n")
+
+        out.append("\nRule hits:\n")
+        for old, count in self.hits.most_common():
+            out.append(f"  {count:>6}  {old}\n")
+
+        unused = self.unused_rules()
+        out.append(f"\nRules that never matched ({len(unused)}):\n")
+        for old in unused:
+            out.append(f"  {old}\n")
+
+        for _, _, diff in self.files:
+            out.append("\n")
+            out.append(diff)
+        return "".join(out)
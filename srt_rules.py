@@ -0,0 +1,223 @@
+"""
+Rule-table loader for the subtitle fixers.
+
+A table is normalized once: identity rules such as ("Workflow", "Workflow")
+and repeated rules are dropped, and a key mapped to two different values is
+reported as a conflict. The normalized table is cached under .srt_cache
+(or SRT_CACHE_DIR), keyed by a hash of the raw rules, so later runs load it
+instead of rebuilding.
+Only the normalized rules are cached: the matcher's regex is still built and
+compiled from them once per run, when replacer or converter is first used.
+
+Term-correction tables live in rules/<profile>.json. A profile lists its
+own rules as [old, new], [old, new, note] or [old, new, {options}], where
+options are srt_replace's match options plus an optional "note". It may
+extend another profile, dropping inherited keys it does not want; its own
+rules override inherited ones. A "files" map of path patterns to profiles
+layers per-file corrections on top for matching files only.
+profile_table() resolves and compiles each combination once per run, so
+every file sharing a profile shares one matcher.
+"""
+
+import fnmatch
+import glob
+import hashlib
+import json
+import os
+import pickle
+import re
+import sys
+from multiprocessing import parent_process
+from functools import lru_cache
+from typing import NamedTuple
+
+from srt_replace import compile_converter, compile_replacements, freeze_rule
+
+# SRT_CACHE_DIR moves the caches, e.g. out of the working copy for a benchmark
+CACHE_DIR = os.environ.get("SRT_CACHE_DIR") or os.path.join(os.path.dirname(os.path.abspath(__file__)), ".srt_cache")
+CACHE_VERSION = 1
+RULES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "rules")
+
+_DIGEST = re.compile(r"[0-9a-f]{16}")
+
+
+class RuleTable(NamedTuple):
+    name: str
+    digest: str
+    rules: tuple      # ((old, new[, options]), ...) in source order, no-ops removed
+    conflicts: tuple  # ((old, kept, dropped), ...)
+
+    @property
+    def replacer(self):
+        return compile_replacements(self.rules)
+
+    @property
+    def converter(self):
+        return compile_converter(self.rules)
+
+    def as_dict(self):
+        return {rule[0]: rule[1] for rule in self.rules}
+
+
+def table_digest(pairs, keep="first", keep_identity=False):
+    digest = hashlib.sha256(f"{CACHE_VERSION}\0{keep}\0{'identity' if keep_identity else ''}\0".encode("utf-8"))
+    for rule in pairs:
+        old, new, *options = freeze_rule(rule)
+        digest.update(f"{old}\0{new}\0".encode("utf-8"))
+        if options:
+            digest.update(f"{options[0]!r}\0".encode("utf-8"))
+    return digest.hexdigest()[:16]
+
+
+def normalize_rules(pairs, keep="first", keep_identity=False):
+    """
+    Drops empty, identity and duplicate rules.
+    keep="first" matches the old sequential replace loops (the first rule wins);
+    keep="last" matches a dict literal, where a repeated key overrides.
+    keep_identity=True keeps rules such as ("Logs", "Logs"): in a single-pass
+    matcher they shield a word from shorter keys, like "s我們" in "Logs我們".
+    """
+    # A key is the old text plus its match options, if any
+    resolved = {}
+    conflicts = []
+    for rule in pairs:
+        old, new, *options = freeze_rule(rule)
+        if not old:
+            continue
+        key = (old, *options)
+        if key in resolved:
+            if resolved[key] != new:
+                if keep == "last":
+                    conflicts.append((old, new, resolved[key]))
+                    resolved[key] = new
+                else:
+                    conflicts.append((old, resolved[key], new))
+            continue
+        resolved[key] = new
+
+    rules = tuple((key[0], new) + key[1:] for key, new in resolved.items() if keep_identity or key[0] != new)
+    return rules, tuple(conflicts)
+
+
+def _read_cache(path):
+    try:
+        with open(path, 'rb') as f:
+            table = pickle.load(f)
+    except (OSError, EOFError, pickle.UnpicklingError, AttributeError):
+        return None
+    return table if isinstance(table, RuleTable) else None
+
+
+def _write_cache(path, table):
+    try:
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, 'wb') as f:
+            pickle.dump(table, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, path)
+    except OSError:
+        # The cache is an optimization only; a read-only checkout still works
+        return
+
+    # Drop stale versions of the same table. The digest must follow the
+    # name directly, or table "unit-1" would match "unit-1-1+chapters-1-3"
+    prefix = os.path.join(CACHE_DIR, f"{table.name}-")
+    for stale in glob.glob(f"{glob.escape(prefix)}*.pickle"):
+        if stale != path and _DIGEST.fullmatch(stale[len(prefix):-len(".pickle")]):
+            try:
+                os.remove(stale)
+            except OSError:
+                pass
+
+
+def load_rule_table(name, pairs, keep="first", keep_identity=False):
+    """Returns the frozen RuleTable for pairs, from the disk cache when possible."""
+    pairs = list(pairs)
+    digest = table_digest(pairs, keep, keep_identity)
+    path = os.path.join(CACHE_DIR, f"{name}-{digest}.pickle")
+
+    table = _read_cache(path)
+    if table is None:
+        rules, conflicts = normalize_rules(pairs, keep, keep_identity)
+        table = RuleTable(name, digest, rules, conflicts)
+        _write_cache(path, table)
+
+    # Worker processes load the same tables; only the main process warns
+    if parent_process() is not None:
+        return table
+    for old, kept, dropped in table.conflicts:
+        print(f"Warning: rule table '{name}' maps {old!r} to both {kept!r} and {dropped!r}; using {kept!r}",
+              file=sys.stderr)
+    return table
+
+
+@lru_cache(maxsize=None)
+def read_profile(name):
+    path = os.path.join(RULES_DIR, f"{name}.json")
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except FileNotFoundError:
+        raise ValueError(f"no rule profile '{name}' in {RULES_DIR}") from None
+
+
+def profile_names():
+    return sorted(os.path.splitext(name)[0] for name in os.listdir(RULES_DIR) if name.endswith(".json"))
+
+
+def _layer(layers):
+    # Earlier layers override later ones key by key; conflicts inside one
+    # layer are left for normalize_rules() to report
+    pairs = []
+    defined = set()
+    for layer in layers:
+        pairs.extend(rule for rule in layer if rule[0] not in defined)
+        defined.update(rule[0] for rule in layer)
+    return pairs
+
+
+def _profile_rule(rule):
+    # [old, new], [old, new, "note"] or [old, new, {options, "note": ...}]
+    old, new, *extra = rule
+    options = {}
+    if extra and isinstance(extra[0], dict):
+        options = {name: value for name, value in extra[0].items() if name != "note"}
+    return freeze_rule((old, new, options))
+
+
+@lru_cache(maxsize=None)
+def profile_rules(name, _seen=()):
+    """The (old, new) pairs of a profile, followed by the ones it inherits."""
+    if name in _seen:
+        raise ValueError(f"rule profile '{name}' extends itself")
+    profile = read_profile(name)
+    layers = [tuple(_profile_rule(rule) for rule in profile.get("rules", ()))]
+
+    parents = profile.get("extends", ())
+    if isinstance(parents, str):
+        parents = [parents]
+    dropped = set(profile.get("drop", ()))
+    for parent in parents:
+        inherited = profile_rules(parent, _seen + (name,))
+        layers.append(tuple(rule for rule in inherited if rule[0] not in dropped))
+    return tuple(_layer(layers))
+
+
+@lru_cache(maxsize=None)
+def _layered_table(names):
+    # Identity rules stay: the profiles' canonical spellings guard those words
+    return load_rule_table("+".join(names), _layer([profile_rules(name) for name in names]), keep_identity=True)
+
+
+def profile_table(name, file_path=None):
+    """
+    Returns the RuleTable of profile `name` for file_path, with the per-file
+    profiles its "files" patterns select layered on top.
+    """
+    names = [name]
+    if file_path is not None:
+        path = os.fspath(file_path).replace(os.sep, '/')
+        for pattern, overlay in read_profile(name).get("files", {}).items():
+            if fnmatch.fnmatchcase(path, pattern):
+                names.insert(len(names) - 1, overlay)
+    return _layered_table(tuple(names))
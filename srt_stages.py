@@ -0,0 +1,203 @@
+"""
+Per-stage timing for the subtitle tools.
+
+Set SRT_PROFILE_STAGES to an output path (or pass --profile-stages PATH to
+the scripts that take arguments) and every file a tool processes records
+the time spent in each stage, its bytes in and out and its cue count.
+write_summary() at the end of main() writes them to PATH as JSON, and the
+same times as collapsed stacks to PATH.folded for flamegraph.pl or
+speedscope.
+
+Stages nest: a stage pulled from inside another, as parse_cues() is from
+the cue-fixing generator, is a child of it. Each stage is charged only its
+own time, not its children's, so the stage totals add up to the wall time
+of the files. Time inside a file that no stage claims is charged to the
+"file" stage itself.
+
+When profiling is off, timed() and timed_iter() hand back what they were
+given, so the scripts run exactly the code they run unprofiled.
+"""
+
+import json
+import os
+from contextlib import contextmanager
+from time import perf_counter
+
+ENV_VAR = "SRT_PROFILE_STAGES"
+
+# Set in the environment so worker processes profile too
+_enabled = bool(os.environ.get(ENV_VAR))
+_stack = []    # [stack path, time charged up to] of every open stage
+_records = []  # finished file records not yet collected
+_run = {"stacks": {}}  # stages outside any file
+_current = _run
+
+
+def enable(path):
+    """Turns profiling on for this process and the workers it starts; write_summary() writes to path."""
+    global _enabled
+    os.environ[ENV_VAR] = path
+    _enabled = True
+
+
+def enabled():
+    return _enabled
+
+
+def _enter(name):
+    now = perf_counter()
+    if _stack:
+        parent = _stack[-1]
+        stacks = _current["stacks"]
+        stacks[parent[0]] = stacks.get(parent[0], 0.0) + now - parent[1]
+        _stack.append([f"{parent[0]};{name}", now])
+    else:
+        _stack.append([name, now])
+
+
+def _exit():
+    now = perf_counter()
+    path, start = _stack.pop()
+    stacks = _current["stacks"]
+    stacks[path] = stacks.get(path, 0.0) + now - start
+    if _stack:
+        _stack[-1][1] = now
+
+
+@contextmanager
+def stage(name):
+    """Charges the time spent in the with block to stage name."""
+    if not _enabled:
+        yield
+        return
+    _enter(name)
+    try:
+        yield
+    finally:
+        _exit()
+
+
+def timed(name, func):
+    """func, with the time spent in each call charged to stage name."""
+    if not _enabled:
+        return func
+
+    def wrapper(*args, **kwargs):
+        _enter(name)
+        try:
+            return func(*args, **kwargs)
+        finally:
+            _exit()
+
+    return wrapper
+
+
+def _timed_iter(name, iterator):
+    while True:
+        _enter(name)
+        try:
+            item = next(iterator)
+        except StopIteration:
+            return
+        finally:
+            _exit()
+        yield item
+
+
+def timed_iter(name, iterable):
+    """iterable, with the time spent producing each item charged to stage name."""
+    if not _enabled:
+        return iterable
+    return _timed_iter(name, iter(iterable))
+
+
+@contextmanager
+def measure_file(path):
+    """Records the stages run in the with block as the processing of one file."""
+    global _current
+    if not _enabled:
+        yield
+        return
+    record = {"file": path, "bytes_in": 0, "bytes_out": 0, "cues": 0, "stacks": {}}
+    outer = _current
+    _current = record
+    start = perf_counter()
+    _enter("file")
+    try:
+        yield
+    finally:
+        _exit()
+        record["seconds"] = perf_counter() - start
+        _current = outer
+        _records.append(record)
+
+
+def count(bytes_in=0, bytes_out=0, cues=0):
+    """Adds to the counters of the file being measured."""
+    if _enabled and _current is not _run:
+        _current["bytes_in"] += bytes_in
+        _current["bytes_out"] += bytes_out
+        _current["cues"] += cues
+
+
+def take_records():
+    """The file records finished since the last call, for a worker to send back."""
+    taken = _records[:]
+    del _records[:]
+    return taken
+
+
+def add_records(records):
+    """Adds file records that a worker process measured."""
+    _records.extend(records)
+
+
+def _stage_totals(stacks):
+    # Stage name -> seconds, whatever it was nested in
+    totals = {}
+    for path, seconds in stacks.items():
+        name = path.rpartition(";")[2]
+        totals[name] = totals.get(name, 0.0) + seconds
+    return totals
+
+
+def write_summary(name):
+    """Writes the JSON summary and collapsed stacks of this run, when profiling is on."""
+    if not _enabled:
+        return
+    path = os.environ[ENV_VAR]
+
+    stacks = dict(_run["stacks"])
+    files = []
+    for record in _records:
+        for stack, seconds in record["stacks"].items():
+            stacks[stack] = stacks.get(stack, 0.0) + seconds
+        files.append({
+            "file": record["file"],
+            "seconds": round(record["seconds"], 6),
+            "bytes_in": record["bytes_in"],
+            "bytes_out": record["bytes_out"],
+            "cues": record["cues"],
+            "stages": {stage: round(seconds, 6) for stage, seconds in _stage_totals(record["stacks"]).items()},
+        })
+
+    summary = {
+        "script": name,
+        "files": len(files),
+        "seconds": round(sum(f["seconds"] for f in files), 6),
+        "bytes_in": sum(f["bytes_in"] for f in files),
+        "bytes_out": sum(f["bytes_out"] for f in files),
+        "cues": sum(f["cues"] for f in files),
+        "stages": {stage: round(seconds, 6) for stage, seconds in
+                   sorted(_stage_totals(stacks).items(), key=lambda item: -item[1])},
+        "per_file": files,
+    }
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(summary, f, ensure_ascii=False, indent=2)
+
+    # One line per stack, weighted in microseconds
+    with open(path + ".folded", 'w', encoding='utf-8') as f:
+        for stack, seconds in sorted(stacks.items()):
+            micros = round(seconds * 1e6)
+            if micros:
+                f.write(f"{name};{stack} {micros}\n")
@@ -0,0 +1,353 @@
+"""
+Line breaking for subtitle text.
+
+break_offsets() finds the line breaks of a cue's text in one left-to-right
+scan and returns (start, end) offsets into it; split_text() slices those out.
+By default every character counts as one column, which reproduces the
+original split_text() of the processing scripts exactly. With
+cjk_widths=True full-width characters count as two columns, so max_length
+is a display width and mixed Chinese/ASCII lines come out visually even.
+
+balanced_break_offsets() is the optional minimum-raggedness alternative:
+instead of filling each line greedily it picks the set of breaks that
+keeps all lines close to max_length, so a block no longer ends in a one-
+or two-character orphan line. It costs about ten times as much per cue as
+greedy breaking, so text wider than BALANCED_MAX_LINES lines, which no
+subtitle cue should be, falls back to the greedy breaks.
+
+join_lines() is the way back: a cue's lines as one line of text.
+"""
+
+import re
+import unicodedata
+from bisect import bisect_left, bisect_right
+from functools import lru_cache
+from itertools import accumulate
+
+# A line may break on either side of one of these
+SEPARATORS = ",，。、"
+_SEPARATOR = re.compile(r"[,，。、\s]")
+_LAST_SEPARATOR = re.compile(r"(?s:.*)([,，。、\s])")
+
+# Balanced mode: extra cost of a break, in units of max_length ** 2, on top
+# of the squared slack of its line. Breaks after SEPARATORS and at spaces
+# are free; words and punctuation are only cut when they do not fit a line.
+MID_BREAK_COST = 0.25  # between two CJK characters, or CJK and ASCII
+HARD_BREAK_COST = 4.0  # inside a run that is wider than a line
+
+# Balanced mode breaks text wider than this many lines greedily; the search
+# grows with the length of the text, and such text is a transcript
+# paragraph rather than a cue
+BALANCED_MAX_LINES = 8
+
+# Balanced-mode breaks: where a line may end, and where the next one may
+# start. A line may break at spaces, after a separator, or between two
+# characters unless that splits an ASCII word or starts a line with a
+# separator.
+_BREAK_END = re.compile(
+    r"(?<=[^\sA-Za-z0-9])(?=[^\s,，。、])"
+    r"|(?<=[A-Za-z0-9])(?=[^\s,，。、A-Za-z0-9])"
+    r"|(?<=\S)(?=\s)"
+)
+_LAST_BREAK_END = re.compile(r"(?s:.*)(?:" + _BREAK_END.pattern + ")")
+_BREAK_START = re.compile(
+    r"(?<=[^\sA-Za-z0-9])(?=[^\s,，。、])"
+    r"|(?<=[A-Za-z0-9])(?=[^\s,，。、A-Za-z0-9])"
+    r"|(?<=\s)(?=\S)"
+)
+_SPACES = re.compile(r"\s+")
+# Characters that may be broken between anywhere, at MID_BREAK_COST
+_PLAIN_RUN = re.compile(r"[^\s,，。、A-Za-z0-9]+")
+
+
+@lru_cache(maxsize=None)
+def _wide_char_width(ch):
+    return 2 if unicodedata.east_asian_width(ch) in ("W", "F") else 1
+
+
+def char_width(ch):
+    """Display columns of one character: 2 for full-width/wide, else 1."""
+    if ch < "\u1100":
+        return 1
+    return _wide_char_width(ch)
+
+
+def text_width(text, cjk_widths=True):
+    """Columns taken by text."""
+    if not cjk_widths or text.isascii():
+        return len(text)
+    return sum(map(_wide_char_width, text))
+
+
+def _column_offsets(text, lo, hi):
+    # columns[i] is the width of text[lo:lo + i]
+    return [0, *accumulate(map(_wide_char_width, text[lo:hi]))]
+
+
+def _chop(start, end, max_length, columns, lo, out):
+    # Hard-wraps a run with no usable break inside it
+    if columns is None:
+        for i in range(start, end, max_length):
+            out.append((i, min(i + max_length, end)))
+        return
+    chunk_start = start
+    for i in range(start + 1, end):
+        if columns[i + 1 - lo] - columns[chunk_start - lo] > max_length:
+            out.append((chunk_start, i))
+            chunk_start = i
+    out.append((chunk_start, end))
+
+
+def break_offsets(text, max_length=20, cjk_widths=False):
+    """
+    Returns the (start, end) offsets of the lines text breaks into.
+
+    Text is filled greedily up to max_length, breaking before or after
+    separators and whitespace; lines are stripped and dropped when blank,
+    and a run longer than max_length with no break in it is cut into
+    max_length pieces.
+    """
+    lo = len(text) - len(text.lstrip())
+    hi = len(text.rstrip())
+    columns = None
+    if cjk_widths and not text[lo:hi].isascii():
+        columns = _column_offsets(text, lo, hi)
+    if hi <= lo or (hi - lo if columns is None else columns[-1]) <= max_length:
+        return [(lo, max(lo, hi))]
+
+    # Greedy fill: each line ends at the last break that still fits, found
+    # by scanning its window backwards. A line whose first word is already
+    # too long ends right after that word.
+    spans = []
+    start = lo
+    while start < hi:
+        if columns is None:
+            limit = start + max_length
+        else:
+            limit = lo + bisect_right(columns, columns[start - lo] + max_length) - 1
+        if limit >= hi:
+            end = hi
+        else:
+            last = _LAST_SEPARATOR.match(text, start, limit + 1)
+            if last:
+                # Break after the separator if it fits, else before it
+                end = last.end() if last.end() <= limit or last.start(1) == start else last.start(1)
+            else:
+                following = _SEPARATOR.search(text, limit + 1, hi)
+                end = following.start() if following else hi
+        spans.append((start, end))
+        start = end
+
+    offsets = []
+    for start, end in spans:
+        while start < end and text[start].isspace():
+            start += 1
+        while end > start and text[end - 1].isspace():
+            end -= 1
+        if start == end:
+            continue
+        if (end - start if columns is None else columns[end - lo] - columns[start - lo]) <= max_length:
+            offsets.append((start, end))
+        else:
+            _chop(start, end, max_length, columns, lo, offsets)
+    return offsets
+
+
+def _break_at(text, end, hi, mid_cost):
+    # (line_end, next_start, cost) of the break ending a line at end
+    if text[end].isspace():
+        return end, _SPACES.match(text, end, hi).end(), 0
+    return end, end, 0 if text[end - 1] in SEPARATORS else mid_cost
+
+
+def _breaks_between(text, first, last, hi, mid_cost):
+    # Every break ending a line at first..last, as _BREAK_END would find them
+    if _PLAIN_RUN.fullmatch(text, first - 1, last + 1):
+        return [(end, end, mid_cost) for end in range(first, last + 1)]
+    breaks = []
+    for end in range(first, last + 1):
+        before = text[end - 1]
+        after = text[end]
+        if after.isspace():
+            if not before.isspace():
+                breaks.append((end, _SPACES.match(text, end, hi).end(), 0))
+        elif before.isspace() or after in SEPARATORS:
+            continue
+        elif before in SEPARATORS:
+            breaks.append((end, end, 0))
+        elif not (before.isascii() and after.isascii() and before.isalnum() and after.isalnum()):
+            breaks.append((end, end, mid_cost))
+    return breaks
+
+
+def _window_layers(text, lo, hi, columns, max_length):
+    """
+    Break candidates for each line of a layout with the fewest lines among
+    word-boundary breaks, or None when some stretch without a break is
+    wider than a line.
+
+    Line m can only end between where a greedy fill from the end and one
+    from the start put it, so only breaks inside those windows are listed.
+    """
+    mid_cost = MID_BREAK_COST * max_length * max_length
+
+    # Latest end of every line: greedy from the start
+    latest = []
+    start = lo
+    while columns[hi] - columns[start] > max_length:
+        limit = bisect_right(columns, columns[start] + max_length) - 1
+        match = _LAST_BREAK_END.match(text, start, limit + 1)
+        if match is None or match.end() <= start:
+            return None
+        end, start, _ = _break_at(text, match.end(), hi, mid_cost)
+        latest.append(end)
+
+    # Earliest end of every line that still leaves room for the rest
+    earliest = []
+    end = hi
+    for _ in latest:
+        first = max(lo, bisect_left(columns, columns[end] - max_length))
+        end = _BREAK_START.search(text, first, end).start()
+        while text[end - 1].isspace():
+            end -= 1
+        earliest.append(end)
+    earliest.reverse()
+
+    layers = [[(lo, lo, 0)]]
+    for first, last in zip(earliest, latest):
+        layers.append(_breaks_between(text, first, last, hi, mid_cost))
+    layers.append([(hi, hi, 0)])
+    return layers
+
+
+def _all_layers(text, lo, hi, columns, max_length):
+    """
+    Like _window_layers(), for text with stretches wider than a line: every
+    break is listed, and those stretches may also be cut between any two
+    characters at HARD_BREAK_COST.
+    """
+    mid_cost = MID_BREAK_COST * max_length * max_length
+    hard_cost = HARD_BREAK_COST * max_length * max_length
+    nodes = [(lo, lo, 0)]
+    for match in _BREAK_END.finditer(text, lo, hi):
+        nodes.append(_break_at(text, match.end(), hi, mid_cost))
+    nodes.append((hi, hi, 0))
+
+    cuttable = [nodes[0]]
+    for before, node in zip(nodes, nodes[1:]):
+        if columns[node[0]] - columns[before[1]] > max_length:
+            cuttable.extend((p, p, hard_cost) for p in range(before[1] + 1, node[0]))
+        cuttable.append(node)
+    nodes = cuttable
+    end_columns = [columns[node[0]] for node in nodes]
+    start_columns = [columns[node[1]] for node in nodes]
+
+    # Greedy from both ends over node indexes, as in _window_layers()
+    latest = [0]
+    while latest[-1] < len(nodes) - 1:
+        i = latest[-1]
+        latest.append(max(i + 1, bisect_right(end_columns, start_columns[i] + max_length) - 1))
+    earliest = [len(nodes) - 1]
+    for _ in range(len(latest) - 2):
+        j = earliest[-1]
+        earliest.append(min(j - 1, bisect_left(start_columns, end_columns[j] - max_length)))
+    earliest.append(0)
+    earliest.reverse()
+    return [nodes[first:last + 1] for first, last in zip(earliest, latest)]
+
+
+def balanced_break_offsets(text, max_length=20, cjk_widths=False):
+    """
+    Returns the (start, end) offsets of the lines text breaks into: the
+    fewest lines among word-boundary breaks that fit max_length and, among
+    those, the breaks with the least squared slack summed over all lines
+    (Knuth-Plass style). Breaks inside a CJK run cost MID_BREAK_COST extra,
+    so separators and spaces win when they are close.
+
+    ASCII words are never split and no line starts with a separator, so
+    this can take more lines than greedy break_offsets(), which cuts a run
+    without a break into max_length pieces. Text wider than
+    BALANCED_MAX_LINES lines gets the greedy breaks.
+    """
+    lo = len(text) - len(text.lstrip())
+    hi = len(text.rstrip())
+    if hi <= lo:
+        return [(lo, lo)]
+    # columns[p] is the width of text[lo:p]
+    if cjk_widths and not text[lo:hi].isascii():
+        columns = [0] * lo + _column_offsets(text, lo, hi)
+    else:
+        columns = range(-lo, hi - lo + 1)
+    if columns[hi] <= max_length:
+        return [(lo, hi)]
+    if columns[hi] > BALANCED_MAX_LINES * max_length:
+        return break_offsets(text, max_length, cjk_widths)
+
+    layers = _window_layers(text, lo, hi, columns, max_length)
+    if layers is None:
+        layers = _all_layers(text, lo, hi, columns, max_length)
+    elif len(layers) == 3:
+        # Two lines that always fit: just pick the best single break
+        first = max_length + columns[lo]
+        second = max_length - columns[hi]
+        end, start, _ = min(layers[1], key=lambda node: (
+            (first - columns[node[0]]) ** 2 + (second + columns[node[1]]) ** 2 + node[2]))
+        return [(lo, end), (start, hi)]
+
+    # Least total squared slack plus break costs, one line at a time. Each
+    # entry is (next_start_column, total_cost, line_end, next_start,
+    # previous_entry). A line wider than max_length (a character wider than
+    # a line) costs more than any layout without one.
+    overfull = (hi - lo + 1) * (1 + HARD_BREAK_COST) * max_length * max_length
+    entries = [(columns[lo], 0, lo, lo, None)]
+    for layer in layers[1:]:
+        reached = []
+        for end, next_start, cost in layer:
+            right = columns[end]
+            best = None
+            for entry in entries:
+                width = right - entry[0]
+                if width <= 0:
+                    break
+                slack = max_length - width
+                total = entry[1] + (slack * slack if slack >= 0 else overfull)
+                if best is None or total < best_total:
+                    best = entry
+                    best_total = total
+            if best is not None:
+                reached.append((columns[next_start], best_total + cost, end, next_start, best))
+        entries = reached
+
+    offsets = []
+    entry = entries[0]
+    while entry[4] is not None:
+        offsets.append((entry[4][3], entry[2]))
+        entry = entry[4]
+    offsets.reverse()
+    return offsets
+
+
+def split_text(text, max_length=20, cjk_widths=False, balanced=False):
+    """Breaks text into lines of at most max_length columns."""
+    breaker = balanced_break_offsets if balanced else break_offsets
+    return [text[start:end] for start, end in breaker(text, max_length, cjk_widths)]
+
+
+def _needs_space(left, right):
+    # Two ASCII letters or digits meeting at the join would run together
+    return left.isascii() and left.isalnum() and right.isascii() and right.isalnum()
+
+
+def join_lines(lines):
+    """
+    Joins stripped, non-empty lines into one, with a space only where two
+    ASCII words would otherwise run together; Chinese text joins directly.
+    """
+    if not lines:
+        return ""
+    parts = [lines[0]]
+    for previous, next_line in zip(lines, lines[1:]):
+        if _needs_space(previous[-1], next_line[0]):
+            parts.append(" ")
+        parts.append(next_line)
+    return "".join(parts)
@@ -0,0 +1,120 @@
+"""
+SRT timecode helpers. Timecodes are handled as integer milliseconds.
+
+Single timecodes are parsed and formatted with plain string operations, no
+regex. shift_times(), scale_times() and clamp_times() work on a whole
+column of times at once, such as the array('i') columns of a CueStore.
+read_last_timing() gets a file's last cue from its tail without reading
+the rest of it.
+"""
+
+import os
+from array import array
+
+TAIL_BLOCK_SIZE = 8192
+MAX_TAIL_SIZE = 65536
+
+
+def parse_timecode(text):
+    """
+    Parses 'HH:MM:SS,mmm' (a '.' separator is accepted too) into milliseconds.
+    Raises ValueError for anything else.
+    """
+    clock, sep, millis = text.strip().replace('.', ',').partition(',')
+    hours, minutes, seconds = clock.split(':')
+    if not sep:
+        millis = "0"
+    return ((int(hours) * 60 + int(minutes)) * 60 + int(seconds)) * 1000 + int(millis)
+
+
+def format_timecode(ms):
+    """Formats milliseconds as 'HH:MM:SS,mmm'."""
+    # %-formatting of four ints is clearly faster than divmod plus an f-string
+    return "%02d:%02d:%02d,%03d" % (ms // 3600000, ms // 60000 % 60, ms // 1000 % 60, ms % 1000)
+
+
+def parse_timing_line(line):
+    """
+    Parses 'start --> end' into (start_ms, end_ms).
+    Returns None when the line is not a valid timing line.
+    """
+    start, arrow, end = line.partition('-->')
+    if not arrow:
+        return None
+    # Anything after the end time (e.g. position settings) is ignored
+    fields = end.split()
+    if not fields:
+        return None
+    try:
+        return parse_timecode(start), parse_timecode(fields[0])
+    except ValueError:
+        return None
+
+
+def last_timing(text):
+    """
+    Returns (start_ms, end_ms) of the last timing line in SRT text, or None.
+    Searches backwards from the end, so only the tail of the text is read.
+    """
+    end = len(text)
+    while True:
+        arrow = text.rfind('-->', 0, end)
+        if arrow < 0:
+            return None
+        line_start = text.rfind('\n', 0, arrow) + 1
+        line_end = text.find('\n', arrow)
+        timing = parse_timing_line(text[line_start:line_end if line_end >= 0 else len(text)])
+        if timing is not None:
+            return timing
+        end = arrow
+
+
+def read_last_timing(path, block_size=TAIL_BLOCK_SIZE, max_tail=MAX_TAIL_SIZE):
+    """
+    last_timing() of an SRT file, reading it backwards in blocks from the
+    end until a valid timing line turns up. If none does within max_tail
+    bytes (a malformed tail, or one huge final cue), the whole file is
+    scanned instead.
+    """
+    with open(path, 'rb') as f:
+        position = f.seek(0, os.SEEK_END)
+        tail = b""
+        while position > 0 and len(tail) < max_tail:
+            step = min(block_size, position)
+            position -= step
+            f.seek(position)
+            tail = f.read(step) + tail
+            # The first line of the tail may be cut off; leave it for the next block
+            if position > 0:
+                complete = tail[tail.find(b"\n") + 1:] if b"\n" in tail else b""
+            else:
+                complete = tail
+            timing = last_timing(complete.decode('utf-8', errors='replace'))
+            if timing is not None:
+                return timing
+        if position == 0:
+            return None
+
+        f.seek(0)
+        return last_timing(f.read().decode('utf-8', errors='replace'))
+
+
+def shift_times(times, offset_ms):
+    """Returns times (an iterable of ms) moved by offset_ms, as an array('i')."""
+    return array('i', [t + offset_ms for t in times])
+
+
+def scale_times(times, factor, origin_ms=0):
+    """
+    Returns times stretched by factor around origin_ms, rounded to whole
+    milliseconds, as an array('i'). Fixes drift between frame rates, e.g.
+    factor=25 / 23.976.
+    """
+    return array('i', [origin_ms + round((t - origin_ms) * factor) for t in times])
+
+
+def clamp_times(times, lo_ms=0, hi_ms=None):
+    """Returns times limited to [lo_ms, hi_ms] as an array('i'); hi_ms=None means no upper bound."""
+    if hi_ms is None:
+        return array('i', [t if t > lo_ms else lo_ms for t in times])
+    return array('i', [lo_ms if t < lo_ms else hi_ms if t > hi_ms else t for t in times])
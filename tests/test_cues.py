@@ -0,0 +1,61 @@
+import io
+
+from srt_cues import Cue, CueStore, format_cues, parse_cues, write_cues
+
+SRT = """1
+00:00:01,000 --> 00:00:02,500
+第一行
+Second line
+
+2
+00:01:00,000 --> 00:01:03,250
+單行
+
+3
+01:00:00,000 --> 01:00:01,000
+Dify 工作流
+"""
+
+
+def test_parse_reads_index_times_and_stripped_lines():
+    cues = list(parse_cues(SRT))
+    assert cues[0] == Cue(1, 1000, 2500, ("第一行", "Second line"))
+    assert cues[2] == Cue(3, 3600000, 3601000, ("Dify 工作流",))
+
+
+def test_format_round_trips():
+    assert format_cues(parse_cues(SRT)) == SRT
+
+
+def test_sources_parse_alike():
+    data = SRT.encode("utf-8")
+    expected = list(parse_cues(SRT))
+    assert list(parse_cues(data)) == expected
+    assert list(parse_cues(io.StringIO(SRT))) == expected
+    assert list(parse_cues(("\ufeff" + SRT).replace("\n", "\r\n").encode("utf-8"))) == expected
+
+
+def test_parse_tolerates_missing_blank_lines_and_stray_text():
+    text = "intro\n1\n00:00:01,000 --> 00:00:02,000\na\n2\n00:00:03,000 --> 00:00:04,000\nb\n\nstray\n"
+    assert [cue.lines for cue in parse_cues(text)] == [("a",), ("b", "stray")]
+
+
+def test_write_cues_matches_format_cues():
+    out = io.StringIO()
+    assert write_cues(parse_cues(SRT), out) == 3
+    assert out.getvalue() == SRT
+
+
+def test_cuestore_keeps_cues():
+    cues = list(parse_cues(SRT))
+    store = CueStore(cues)
+    assert len(store) == 3
+    assert list(store) == cues
+    assert store[1] == cues[1]
+    assert [store.line_count(i) for i in range(len(store))] == [2, 1, 1]
+    assert format_cues(store) == SRT
+
+
+def test_cuestore_shift():
+    store = CueStore(parse_cues(SRT)).shift(500)
+    assert [(cue.start_ms, cue.end_ms) for cue in store][:2] == [(1500, 3000), (60500, 63750)]
@@ -0,0 +1,65 @@
+import os
+
+import pytest
+
+import process_global_srt
+import process_pipeline
+from check_and_fix_srt_global import convert_file, sc_to_tc_table
+from srt_fixer import rewrite_srt
+from srt_pipeline import DEFAULT_STAGES, Pipeline, merge, parse_stages, run_file
+from srt_rules import profile_table
+
+SRT = """1
+00:00:01,000 --> 00:00:03,000
+这个工作流
+我们可以设定
+
+2
+00:00:03,000 --> 00:00:06,000
+今天我们要来看看 Dify 的知识库设定，还有 Workflow 的发布跟 API 的调用方式
+
+3
+00:00:06,000 --> 00:00:07,000
+单行
+"""
+
+
+def test_default_profile_matches_process_global_srt():
+    assert process_pipeline.PROFILE == process_global_srt.PROFILE
+
+
+def test_default_stages_match_the_two_scripts(tmp_path):
+    # check_and_fix_srt_global.py, then process_global_srt.py, against one pass
+    two_pass = tmp_path / "1-1.srt"
+    one_pass = tmp_path / "one" / "1-1.srt"
+    one_pass.parent.mkdir()
+    for path in (two_pass, one_pass):
+        path.write_text(SRT, encoding="utf-8")
+    table = profile_table(process_global_srt.PROFILE, str(two_pass))
+    converter = sc_to_tc_table().converter
+
+    checked = convert_file(converter, str(two_pass))
+    rewrite_srt(table.replacer, str(two_pass))
+    stats = run_file(parse_stages(",".join(DEFAULT_STAGES)), str(one_pass), converter, table.replacer)
+
+    assert one_pass.read_bytes() == two_pass.read_bytes()
+    assert stats["issues"] == checked["issues"]
+    assert stats["written"] == os.path.getsize(one_pass)
+
+
+def test_run_file_leaves_unchanged_files_alone(tmp_path):
+    path = tmp_path / "unit.srt"
+    path.write_text(SRT, encoding="utf-8")
+    assert run_file(Pipeline((merge,)), str(path))["written"]
+    mtime = path.stat().st_mtime_ns
+    stats = run_file(Pipeline((merge,)), str(path))
+    assert stats["written"] == 0
+    assert stats["cues"] == 3
+    assert path.stat().st_mtime_ns == mtime
+    assert [p.name for p in tmp_path.iterdir()] == ["unit.srt"]
+
+
+def test_parse_stages_rejects_unknown_names():
+    assert parse_stages("sc2tc, merge").names == ("sc2tc", "merge")
+    with pytest.raises(ValueError, match="nope"):
+        parse_stages("sc2tc,nope")
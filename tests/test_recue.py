@@ -0,0 +1,34 @@
+from srt_cues import Cue, parse_cues
+from srt_recue import recue, recue_file, split_cue
+
+
+def test_split_cue_shares_time_by_characters():
+    cue = Cue(7, 0, 6000, ("aa", "bb", "cccc", "dddd"))
+    pieces = split_cue(cue)
+    assert [piece.lines for piece in pieces] == [("aa", "bb"), ("cccc", "dddd")]
+    assert [(piece.start_ms, piece.end_ms) for piece in pieces] == [(0, 2000), (2000, 6000)]
+    assert all(piece.index == 7 for piece in pieces)
+
+
+def test_split_cue_keeps_minimum_duration():
+    cue = Cue(1, 0, 1000, ("a", "b", "c", "d"))
+    assert split_cue(cue, min_duration_ms=800) == [cue]
+    pieces = split_cue(Cue(1, 0, 2000, ("a", "b", "c", "d", "e", "f")), min_duration_ms=800)
+    assert len(pieces) == 2
+    assert all(piece.end_ms - piece.start_ms >= 800 for piece in pieces)
+
+
+def test_recue_renumbers():
+    cues = [Cue(1, 0, 6000, ("a", "b", "c")), Cue(2, 6000, 7000, ("d",))]
+    assert [cue.index for cue in recue(cues)] == [1, 2, 3]
+
+
+def test_recue_file_in_place(tmp_path):
+    path = tmp_path / "unit.srt"
+    path.write_text("1\n00:00:00,000 --> 00:00:06,000\na\nb\nc\nd\n\n2\n00:00:06,000 --> 00:00:07,000\ne\n",
+                    encoding="utf-8")
+    assert recue_file(path, path) == 3
+    cues = list(parse_cues(path.read_text(encoding="utf-8")))
+    assert [cue.lines for cue in cues] == [("a", "b"), ("c", "d"), ("e",)]
+    assert [cue.index for cue in cues] == [1, 2, 3]
+    assert [p.name for p in tmp_path.iterdir()] == ["unit.srt"]
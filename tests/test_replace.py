@@ -0,0 +1,55 @@
+import random
+from collections import Counter
+
+from check_and_fix_srt_global import SC_TO_TC_PAIRS
+from convert_sc_tc_4_2 import REPLACEMENTS
+from srt_replace import compile_converter, compile_replacements
+from srt_rules import profile_table
+
+
+def sequential_replace(text, pairs):
+    # The loops the scripts used before srt_replace
+    for old, new in pairs:
+        text = text.replace(old, new)
+    return text
+
+
+def test_replacer_matches_longest_first_sequential_replace():
+    rules = [("Dify", "Dify"), ("Defy", "Dify"), ("工作流", "Workflow"), ("工作", "任務"), ("Ragflow", "RAGFlow")]
+    ordered = sorted(rules, key=lambda rule: len(rule[0]), reverse=True)
+    text = "Defy 的工作流和工作，還有 Ragflow 與 Dify"
+    assert compile_replacements(rules)(text) == sequential_replace(text, ordered)
+
+
+def test_replacer_does_not_rematch_its_output():
+    replacer = compile_replacements([("A", "B"), ("B", "C")])
+    assert replacer("AB") == "BC"
+
+
+def test_replacer_word_option_leaves_longer_words_alone():
+    replacer = compile_replacements([("ON", "ARM", {"word": True})])
+    assert replacer("ON的版本 JSON MONDAY") == "ARM的版本 JSON MONDAY"
+
+
+def test_replacer_counts_hits():
+    hits = Counter()
+    compile_replacements([("Defy", "Dify"), ("工作流", "Workflow")])("Defy 工作流 Defy", hits)
+    assert hits == {"Defy": 2, "工作流": 1}
+
+
+def test_profile_replacer_applies_each_rule_once():
+    rules = [rule for rule in profile_table("review").rules if len(rule) == 2]
+    replacer = compile_replacements(rules)
+    # The whole key matches, longest first, and its output is not rewritten again
+    for old, new in rules:
+        assert replacer(f"「{old}」") == f"「{new}」"
+
+
+def test_converter_matches_sequential_replace():
+    rng = random.Random(0)
+    for pairs in (SC_TO_TC_PAIRS, list(REPLACEMENTS.items())):
+        converter = compile_converter(pairs)
+        keys = [old for old, _ in pairs]
+        for _ in range(200):
+            text = "".join(rng.choice(keys + ["，", " ", "Dify"]) for _ in range(30))
+            assert converter(text) == sequential_replace(text, pairs)
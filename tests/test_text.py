@@ -0,0 +1,80 @@
+import random
+import re
+
+from srt_text import BALANCED_MAX_LINES, balanced_break_offsets, break_offsets, join_lines, split_text, text_width
+
+
+def original_split_text(text, max_length=20):
+    # split_text as the processing scripts carried it before srt_text
+    text = text.strip()
+    if len(text) <= max_length:
+        return [text]
+    parts = re.split(r'([,，。、\s])', text)
+    lines = []
+    current_line = ""
+    for part in parts:
+        if len(current_line) + len(part) > max_length:
+            if current_line:
+                lines.append(current_line)
+            current_line = part
+        else:
+            current_line += part
+    if current_line:
+        lines.append(current_line)
+    lines = [line.strip() for line in lines if line.strip()]
+    final_lines = []
+    for line in lines:
+        if len(line) <= max_length:
+            final_lines.append(line)
+        else:
+            for i in range(0, len(line), max_length):
+                final_lines.append(line[i:i+max_length])
+    return final_lines
+
+
+WORDS = ["Dify", "工作流", "我們", "可以", "這邊", "，", "。", "、", " ", "API Key", "knowledge-base", "知識庫然後再來設定"]
+
+
+def random_texts(count, seed=0):
+    rng = random.Random(seed)
+    for _ in range(count):
+        yield "".join(rng.choice(WORDS) for _ in range(rng.randint(0, 40)))
+
+
+def test_split_text_matches_original():
+    for text in random_texts(2000):
+        for max_length in (8, 20):
+            assert split_text(text, max_length) == original_split_text(text, max_length)
+
+
+def test_break_offsets_slice_split_text():
+    for text in random_texts(200, seed=1):
+        lines = [text[start:end] for start, end in break_offsets(text)]
+        assert [line for line in lines if line] == [line for line in split_text(text) if line]
+
+
+def test_balanced_lines_fit_and_keep_the_words():
+    for text in random_texts(500, seed=2):
+        for cjk_widths in (False, True):
+            offsets = balanced_break_offsets(text, 20, cjk_widths)
+            lines = [text[start:end] for start, end in offsets]
+            assert "".join(lines).replace(" ", "") == text.strip().replace(" ", "")
+            if text_width(text.strip(), cjk_widths) <= BALANCED_MAX_LINES * 20:
+                assert all(text_width(line, cjk_widths) <= 20 for line in lines)
+
+
+def test_balanced_avoids_orphan_lines():
+    text = "今天我們要來看看 Dify 的知識庫設定，可以"
+    assert split_text(text, 20) == ["今天我們要來看看 Dify 的知識庫設定", "，可以"]
+    assert split_text(text, 20, balanced=True) == ["今天我們要來看看 Dify", "的知識庫設定，可以"]
+
+
+def test_balanced_falls_back_to_greedy_for_long_text():
+    text = "我們可以，" * (BALANCED_MAX_LINES * 20)
+    assert balanced_break_offsets(text, 20) == break_offsets(text, 20)
+
+
+def test_join_lines_spaces_ascii_words_only():
+    assert join_lines(["Dify", "Workflow"]) == "Dify Workflow"
+    assert join_lines(["我們", "可以"]) == "我們可以"
+    assert join_lines(["使用", "Dify"]) == "使用Dify"
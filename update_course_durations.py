@@ -1,51 +1,61 @@
 import json
 import os
-import re
 import math
 from pathlib import Path
 
+from srt_async import map_io
+from srt_index import SrtIndex
+from srt_stages import stage, write_summary
+from srt_timecode import read_last_timing
+
+TREE_ROOT = Path('課綱')
+
 def parse_duration_from_srt(srt_path):
     """
     Parses the last timestamp from an SRT file and returns the duration in minutes.
     Returns None if no comprehensive timestamp is found.
     """
-    try:
-        with open(srt_path, 'r', encoding='utf-8') as f:
-            content = f.read()
-            
-        # Regex to find timestamps: 00:00:00,000 --> 00:00:05,000
-        # We want the end time of the last block.
-        # It's safer to find all matches and take the last one's end time.
-        timestamp_pattern = re.compile(r'(\d{2}):(\d{2}):(\d{2})[,.](\d{3})')
-        matches = list(timestamp_pattern.finditer(content))
-        
-        if not matches:
-            return None
-            
-        # Last match is naturally the end time of the last subtitle? 
-        # Actually SRT structure is: 
-        # N
-        # Start --> End
-        # Text
-        #
-        # So every block has two timestamps. The pattern will match twice per block.
-        # The very last match in the file should be the end time of the last subtitle.
-        
-        last_match = matches[-1]
-        hours = int(last_match.group(1))
-        minutes = int(last_match.group(2))
-        seconds = int(last_match.group(3))
-        milliseconds = int(last_match.group(4))
-        
-        total_seconds = hours * 3600 + minutes * 60 + seconds + milliseconds / 1000.0
-        duration_minutes = math.ceil(total_seconds / 60.0) # Round up to nearest minute
-        
-        # If it's 0 minutes (very short), make it at least 1
-        return max(1, duration_minutes)
+    # The end time of the last subtitle block is the video's duration.
+    # Only the tail of the file is read to find it.
+    timing = read_last_timing(srt_path)
+    
+    if timing is None:
+        return None
         
+    total_seconds = timing[1] / 1000.0
+    duration_minutes = math.ceil(total_seconds / 60.0) # Round up to nearest minute
+    
+    # If it's 0 minutes (very short), make it at least 1
+    return max(1, duration_minutes)
+
+def find_unit_duration(srt_index, unit_id, content_path_str):
+    """
+    (the unit's .srt, its duration in minutes, error message), with None for
+    what was not found. Safe to run for several units at once, so errors
+    are returned for the caller to print in unit order.
+    """
+    # Resolve absolute path to content directory
+    # contentPath is relative to root, e.g. "課綱/..."
+    # We assume the .srt file is in the same directory as the content file
+    content_dir = Path(content_path_str).parent
+    
+    if not content_dir.exists():
+        # Try relative to current script dir if paths are relative
+        content_dir = Path.cwd() / content_dir
+    if not content_dir.exists():
+        return None, None, None
+    
+    # Search for .srt files in this directory. The index matches the unit
+    # ID exactly ('1-1' never picks '11-1.srt') and falls back to the only
+    # .srt in the folder, as there is usually one unit per folder
+    target_srt = srt_index.find_unit_srt(unit_id, content_dir)
+    if not target_srt:
+        return None, None, None
+    target_srt = Path(target_srt)
+    try:
+        return target_srt, parse_duration_from_srt(target_srt), None
     except Exception as e:
-        print(f"Error parsing {srt_path}: {e}")
-        return None
+        return target_srt, None, f"Error parsing {target_srt}: {e}"
 
 def update_courses():
     courses_path = Path('courses.json')
@@ -56,6 +66,22 @@ def update_courses():
     with open(courses_path, 'r', encoding='utf-8') as f:
         data = json.load(f)
 
+    # Directory listing of the course tree, reused across runs
+    with stage("index"):
+        srt_index = SrtIndex(TREE_ROOT)
+    print(f"SRT index: {srt_index.rescanned} of {len(srt_index.dirs)} directories rescanned")
+
+    # Find and read every unit's SRT up front; the lookups and tail reads
+    # of many units overlap, and results come back in unit order
+    lookups = [
+        (unit['id'], unit['contentPath'])
+        for chapter in data.get('chapters', [])
+        for unit in chapter.get('units', [])
+        if unit.get('contentPath')
+    ]
+    with stage("durations"):
+        found = iter(map_io(lambda lookup: find_unit_duration(srt_index, *lookup), lookups))
+
     total_course_duration = 0
     updates_log = []
 
@@ -65,54 +91,16 @@ def update_courses():
         
         for unit in chapter.get('units', []):
             original_duration = unit.get('duration', 0)
-            content_path_str = unit.get('contentPath', '')
-            
-            # Resolve absolute path to content directory
-            # contentPath is relative to root, e.g. "課綱/..."
-            # We assume the .srt file is in the same directory as the content file
             
-            if not content_path_str:
+            if not unit.get('contentPath'):
                 chapter_duration += original_duration
                 continue
                 
-            content_path = Path(content_path_str)
-            content_dir = content_path.parent
-            
-            # Search for .srt files in this directory
-            # We look for a file that contains the unit ID or just any .srt if there's only one video per folder
-            # The folder structure seems to be one unit per folder usually.
-            
-            if not content_dir.exists():
-                # Try relative to current script dir if paths are relative
-                content_dir = Path.cwd() / content_dir
-                
-            found_duration = None
-            if content_dir.exists():
-                srt_files = list(content_dir.glob('*.srt'))
-                
-                # Heuristic: if multiple srt, try to match unit ID? 
-                # IDs are like 'unit-1-1', filenames like '1-1.srt'
-                # Let's try to match the filename specifically if possible.
-                # Extract '1-1' from 'unit-1-1'
-                unit_id_short = unit['id'].replace('unit-', '') # '1-1'
-                
-                target_srt = None
-                for srt in srt_files:
-                    if unit_id_short in srt.name:
-                        target_srt = srt
-                        break
-                
-                # If no specific match, but there is exactly one srt, use it.
-                if not target_srt and len(srt_files) == 1:
-                    target_srt = srt_files[0]
-                    
-                if target_srt:
-                    duration = parse_duration_from_srt(target_srt)
-                    if duration is not None:
-                        found_duration = duration
-                        print(f"  - Unit {unit['title']}: Found {target_srt.name}, duration {duration} min (was {original_duration})")
-            
+            target_srt, found_duration, error = next(found)
+            if error:
+                print(error)
             if found_duration is not None:
+                print(f"  - Unit {unit['title']}: Found {target_srt.name}, duration {found_duration} min (was {original_duration})")
                 unit['duration'] = found_duration
                 chapter_duration += found_duration
                 if found_duration != original_duration:
@@ -130,6 +118,8 @@ def update_courses():
 
     with open(courses_path, 'w', encoding='utf-8') as f:
         json.dump(data, f, indent=4, ensure_ascii=False)
+    srt_index.save()
+    write_summary("update_course_durations")
         
     print("\ncourses.json updated successfully.")
     